@@ -4,6 +4,54 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     gemini_api_key: str = ""
+    llm_provider: str = "gemini"  # "gemini" or "standin" (offline, for benchmarks)
+    llm_recordings_path: str = ""  # JSONL: Gemini responses are appended, the stand-in replays them
+    llm_standin_latency: str = "median=1.5,sigma=0.3"
+    llm_standin_error_rate: float = 0.0
+    llm_standin_seed: int | None = None
+    llm_model: str = "gemini-2.5-flash"
+    llm_timeout_seconds: float = 30.0
+    llm_deadline_seconds: float = 12.0
+    llm_max_retries: int = 1
+    llm_retry_backoff_seconds: float = 0.5
+    llm_hedge_enabled: bool = False
+    llm_hedge_delay_seconds: float = 6.0  # used until enough latencies are recorded for a p95
+    llm_hedge_min_samples: int = 20
+    llm_cache_backend: str = "memory"  # "memory", "sqlite" or "none"
+    llm_cache_path: str = "./llm_cache.db"
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 512
+    llm_max_concurrency: int = 4
+    llm_queue_timeout_seconds: float = 10.0
+    llm_prefix_cache_enabled: bool = False
+    llm_prefix_cache_ttl_seconds: int = 600
+    # Provider minimum for a cached content entry; while the cache is on, the analysis
+    # prefix's JD budget is raised past llm_prompt_jd_tokens so long JDs can reach it
+    llm_prefix_cache_min_tokens: int = 1024
+    llm_prompt_resume_tokens: int = 900
+    llm_prompt_jd_tokens: int = 600
+    analysis_store_ttl_seconds: int = 1800
+    analysis_store_max_entries: int = 256
+    analysis_cache_enabled: bool = True
+    analysis_cache_max_entries: int = 2048
+    analysis_cache_max_bytes: int = 64 * 1024 * 1024
+    analysis_cache_ttl_seconds: int = 86400
+    analysis_cache_path: str = ""  # SQLite file for a persistent tier behind the in-process LRU
+    scoring_workers: int = 0  # worker processes for the scoring layers; 0 runs them in a thread
+    batch_max_resumes: int = 1000
+    batch_chunk_size: int = 16  # resumes per batched encode
+    batch_concurrency: int = 4  # chunks in flight per batch request
+    optimize_job_workers: int = 2  # concurrent /optimize/jobs; 0 disables job mode
+    optimize_job_db_path: str = "./optimize_jobs.db"
+    optimize_job_max_attempts: int = 2
+    optimize_job_ttl_seconds: int = 3600  # how long finished results stay retrievable
+    metrics_enabled: bool = True  # per-stage histograms and work counters at /metrics
+    profile_token: str = ""  # requests with a matching X-Profile-Token header are profiled
+    profile_sample_every: int = 0  # also profile every Nth request; 0 disables
+    profile_dir: str = "./profiles"
+    profile_max_files: int = 200
+    profile_max_bytes: int = 100 * 1024 * 1024
+    gzip_minimum_size: int = 1024  # bytes; smaller responses are sent uncompressed
     model_cache_dir: str = "./models"
     cors_origins: str = "http://localhost:3000,https://*.vercel.app,https://*.hf.space"
 
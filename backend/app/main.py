@@ -1,12 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import get_settings
 from app.routers import analyze, optimize
+from app.services.analysis_cache import analysis_cache_stats
+from app.services.llm_client import llm_cache_stats, llm_call_stats
+from app.services.llm_gateway import get_llm_gateway
+from app.services.llm_prefix_cache import get_prefix_registry
+from app.services.optimize_jobs import get_job_queue, start_job_queue, stop_job_queue
+from app.services.scoring_pool import start_scoring_pool, shutdown_scoring_pool
+from app.utils import metrics
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.server_timing import ServerTimingMiddleware
+from app.utils.streaming import StreamAwareGZipMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_scoring_pool()
+    await start_job_queue(optimize.run_optimization_job)
+    yield
+    await stop_job_queue()
+    shutdown_scoring_pool()
+
 
 app = FastAPI(
     title="ATS Score API",
     description="AI-Powered ATS Score Analyzer",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 settings = get_settings()
@@ -18,6 +42,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ServerTimingMiddleware)
+if settings.profile_token or settings.profile_sample_every > 0:
+    app.add_middleware(
+        ProfilerMiddleware,
+        directory=settings.profile_dir,
+        token=settings.profile_token,
+        sample_every=settings.profile_sample_every,
+        max_files=settings.profile_max_files,
+        max_bytes=settings.profile_max_bytes,
+    )
+# compresslevel 9 (the default) costs several times the CPU for a few percent on JSON;
+# NDJSON streams are left uncompressed so each line reaches the client as it is written
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=6)
 
 app.include_router(analyze.router, prefix="/api/v1", tags=["analyze"])
 app.include_router(optimize.router, prefix="/api/v1", tags=["optimize"])
@@ -26,3 +63,43 @@ app.include_router(optimize.router, prefix="/api/v1", tags=["optimize"])
 @app.get("/api/v1/health")
 async def health_check():
     return {"status": "healthy", "service": "ATS Score API"}
+
+
+@app.get("/api/v1/stats")
+async def stats():
+    prefix_registry = get_prefix_registry()
+    job_queue = get_job_queue()
+    return {
+        "analysis_cache": analysis_cache_stats.as_dict(),
+        "llm_cache": llm_cache_stats.as_dict(),
+        "llm_gateway": get_llm_gateway().stats.as_dict(),
+        "llm_calls": llm_call_stats.as_dict(),
+        "llm_prefix_cache": prefix_registry.stats.as_dict() if prefix_registry else None,
+        "optimize_jobs": job_queue.store.counts() if job_queue else None,
+    }
+
+
+# Cache and gateway counters already exist as stats objects; they are read at scrape time
+metrics.registry.callback(
+    "ats_cache_hits_total", "Cache hits", "counter", ("cache",),
+    lambda: {("llm",): llm_cache_stats.hits, ("analysis",): analysis_cache_stats.hits},
+)
+metrics.registry.callback(
+    "ats_cache_misses_total", "Cache misses", "counter", ("cache",),
+    lambda: {("llm",): llm_cache_stats.misses, ("analysis",): analysis_cache_stats.misses},
+)
+metrics.registry.callback(
+    "ats_llm_upstream_calls_total", "LLM calls that reached the provider", "counter", (),
+    lambda: {(): get_llm_gateway().stats.upstream_calls},
+)
+metrics.registry.callback(
+    "ats_llm_in_flight", "LLM calls currently in flight", "gauge", (),
+    lambda: {(): get_llm_gateway().stats.in_flight},
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    if not metrics.registry.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,36 @@
+"""Load the read-only artifacts once in a server's master process, before it forks workers.
+
+Forked workers then share the model weights and taxonomy tables with the
+master copy-on-write instead of each loading a private copy.
+"""
+import gc
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def preload(freeze: bool = True) -> None:
+    """Load the sentence transformer and KeyBERT (sharing it) and build the lookup tables.
+
+    With ``freeze``, everything allocated so far moves to the GC's permanent
+    generation: collections in the workers then never walk (and so never
+    write refcount/GC headers into) these objects, which keeps their pages
+    shared. Nothing is encoded here, so no torch thread pools exist yet when
+    the master forks.
+    """
+    from app.services.analysis_cache import pipeline_stamp
+    from app.services.jd_parser import _get_keybert
+    from app.services.semantic_scorer import _get_model
+    from app.utils.variations import build_variation_index
+
+    started = time.perf_counter()
+    _get_model()
+    _get_keybert()
+    build_variation_index()
+    pipeline_stamp()
+    logger.info(f"Preloaded models and taxonomies in {time.perf_counter() - started:.1f}s")
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
@@ -1,79 +1,120 @@
-import uuid
-from datetime import datetime
-from fastapi import APIRouter, Form
+import asyncio
+import time
 
+from fastapi import APIRouter, Form, HTTPException
+
+from app.config import get_settings
 from app.models.schemas import ATSAnalysisResponse
-from app.services.resume_parser import parse_resume
-from app.services.jd_parser import parse_jd
-from app.services.keyword_matcher import compute_keyword_score
-from app.services.semantic_scorer import compute_semantic_score
-from app.services.structure_scorer import compute_structure_score
-from app.services.llm_analyzer import analyze_with_llm
-from app.services.score_aggregator import compute_overall_score, get_recruiter_status, get_rank_estimate
-from app.services.suggestion_engine import generate_suggestions
+from app.services.analysis_cache import analysis_cache_key, get_cached_analysis, store_analysis
+from app.services.analysis_pipeline import build_analysis
+from app.services.analysis_store import remember_analysis
+from app.services.batch_analysis import analyze_batch
+from app.services.llm_analyzer import analyze_with_llm, prepare_analysis_prefix
+from app.services.scoring_pool import run_scoring
+from app.utils.json_stream import FieldCallback, replay_fields
+from app.utils import timing
+from app.utils.responses import ModelJSONResponse, select_fields
+from app.utils.streaming import ndjson_events, ndjson_stream
 
 router = APIRouter()
 
+# Echoes of the inputs and per-keyword detail, left out of compact responses
+COMPACT_EXCLUDE = {"parsed_resume", "parsed_jd", "keyword_results"}
+
 
 @router.post("/analyze", response_model=ATSAnalysisResponse)
 async def analyze_resume(
     resume_text: str = Form(""),
     jd_text: str = Form(...),
     include_llm_analysis: bool = Form(True),
+    bypass_llm_cache: bool = Form(False),
+    compact: bool = Form(False),
+    fields: str = Form(""),
+    include_timings: bool = Form(False),
+):
+    include, exclude = select_fields(compact, fields, COMPACT_EXCLUDE)
+    analysis = await _run_analysis(resume_text, jd_text, include_llm_analysis, bypass_llm_cache)
+    extra = {"timings": timing.current_breakdown()} if include_timings else None
+    return ModelJSONResponse(analysis, include=include, exclude=exclude, extra=extra)
+
+
+@router.post("/analyze/stream")
+async def analyze_resume_stream(
+    resume_text: str = Form(""),
+    jd_text: str = Form(...),
+    include_llm_analysis: bool = Form(True),
+    bypass_llm_cache: bool = Form(False),
+    compact: bool = Form(False),
+    fields: str = Form(""),
+):
+    """Same as /analyze, but streams LLM analysis fields as NDJSON while they are generated."""
+    include, exclude = select_fields(compact, fields, COMPACT_EXCLUDE)
+    return ndjson_stream(lambda partial: _run_analysis(
+        resume_text, jd_text, include_llm_analysis, bypass_llm_cache,
+        on_llm_field=partial("analysis"),
+    ), include=include, exclude=exclude)
+
+
+@router.post("/analyze/batch")
+async def analyze_resume_batch(
+    jd_text: str = Form(...),
+    resume_texts: list[str] = Form(...),
+    resume_ids: list[str] = Form([]),
+    top_k: int = Form(0),
 ):
-    # Parse resume and JD
-    parsed_resume = parse_resume(text=resume_text)
-    parsed_jd = parse_jd(jd_text)
+    """Score many resumes against one JD, streaming one NDJSON summary line per resume.
 
-    # Layer 1: Keyword matching
-    keyword_score, keyword_results = compute_keyword_score(parsed_resume, parsed_jd)
+    Deterministic layers only (no LLM analysis). Lines arrive as chunks
+    finish; with ``top_k`` only the best ``top_k`` are sent, ranked, at the end.
+    """
+    limit = get_settings().batch_max_resumes
+    if len(resume_texts) > limit:
+        raise HTTPException(status_code=413, detail=f"At most {limit} resumes per batch")
+    return ndjson_events(analyze_batch(resume_texts, jd_text, resume_ids, top_k))
 
-    # Layer 2: Semantic similarity
-    semantic_score, semantic_results = compute_semantic_score(parsed_resume, parsed_jd)
 
-    # Layer 3: Structure scoring
-    structure_score, structure_results = compute_structure_score(parsed_resume)
+async def _run_analysis(
+    resume_text: str,
+    jd_text: str,
+    include_llm_analysis: bool,
+    bypass_llm_cache: bool,
+    on_llm_field: FieldCallback | None = None,
+) -> ATSAnalysisResponse:
+    # Identical submissions (retries, shared links, re-renders) reuse the whole result;
+    # the cache may be on disk, so reads and writes stay off the event loop
+    cache_key = analysis_cache_key(resume_text, jd_text, include_llm_analysis)
+    cached = None if bypass_llm_cache else await asyncio.to_thread(get_cached_analysis, cache_key)
+    if cached is not None:
+        if on_llm_field is not None and cached.llm_analysis is not None:
+            replay_fields(cached.llm_analysis.model_dump(), on_llm_field)
+        remember_analysis(cached, resume_text, jd_text)
+        return cached
 
-    # Overall score
-    overall_score = compute_overall_score(keyword_score, semantic_score, structure_score)
-    recruiter_status = get_recruiter_status(overall_score)
-    rank_estimate = get_rank_estimate(overall_score)
+    started = time.perf_counter()
+    # The JD prefix of the LLM prompt is known up front; register it while scoring runs
+    prefix_task = asyncio.create_task(prepare_analysis_prefix(jd_text)) if include_llm_analysis else None
+    scored = await run_scoring(resume_text, jd_text)
 
     # LLM analysis (optional)
     llm_analysis = None
-    if include_llm_analysis:
+    if prefix_task is not None:
+        await prefix_task
         llm_analysis = await analyze_with_llm(
-            resume_text=parsed_resume.raw_text,
+            resume_text=scored.parsed_resume.raw_text,
             jd_text=jd_text,
-            keyword_score=keyword_score,
-            semantic_score=semantic_score,
-            structure_score=structure_score,
+            keyword_score=scored.keyword_score,
+            semantic_score=scored.semantic_score,
+            structure_score=scored.structure_score,
+            bypass_cache=bypass_llm_cache,
+            on_field=on_llm_field,
+            sections=scored.parsed_resume.sections,
+            keyword_results=scored.keyword_results,
         )
 
-    # Generate suggestions
-    suggestions = generate_suggestions(
-        keyword_results=keyword_results,
-        structure_results=structure_results,
-        semantic_results=semantic_results,
-        llm_analysis=llm_analysis,
-    )
-
-    analysis_id = str(uuid.uuid4())[:8]
-
-    return ATSAnalysisResponse(
-        overall_score=overall_score,
-        keyword_score=keyword_score,
-        semantic_score=semantic_score,
-        structure_score=structure_score,
-        recruiter_status=recruiter_status,
-        rank_estimate=rank_estimate,
-        keyword_results=keyword_results,
-        semantic_results=semantic_results,
-        structure_results=structure_results,
-        parsed_resume=parsed_resume,
-        parsed_jd=parsed_jd,
-        llm_analysis=llm_analysis,
-        suggestions=suggestions,
-        analysis_id=analysis_id,
-        analyzed_at=datetime.utcnow(),
-    )
+    analysis = build_analysis(scored, llm_analysis)
+    # A failed LLM call isn't cached, so the next identical request tries again
+    if llm_analysis is not None or not include_llm_analysis:
+        await asyncio.to_thread(store_analysis, cache_key, analysis, time.perf_counter() - started)
+    # Retained for a bounded time so /optimize can skip straight to rewriting
+    remember_analysis(analysis, resume_text, jd_text)
+    return analysis
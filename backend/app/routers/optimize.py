@@ -1,71 +1,196 @@
-from fastapi import APIRouter, Form
-
-from app.models.schemas import OptimizeResponse, ATSAnalysisResponse
-from app.services.resume_parser import parse_resume, is_latex
-from app.services.jd_parser import parse_jd
-from app.services.keyword_matcher import compute_keyword_score
-from app.services.semantic_scorer import compute_semantic_score
-from app.services.structure_scorer import compute_structure_score
-from app.services.score_aggregator import compute_overall_score, get_recruiter_status, get_rank_estimate
-from app.services.suggestion_engine import generate_suggestions
-from app.services.llm_analyzer import analyze_with_llm
+import asyncio
+
+from fastapi import APIRouter, Form, HTTPException
+
+from app.models.schemas import OptimizeResponse
+from app.services.resume_parser import is_latex
+from app.services.latex_parser import get_latex_map
+from app.services.analysis_pipeline import build_analysis
+from app.services.analysis_store import recall_analysis
+from app.services.optimize_jobs import FINISHED, get_job_queue
+from app.services.llm_analyzer import analyze_with_llm, prepare_analysis_prefix
+from app.services.scoring_pool import run_scoring
 from app.services.resume_optimizer import optimize_resume
-from datetime import datetime
-import uuid
+from app.utils.json_stream import FieldCallback, replay_fields
+from app.utils import timing
+from app.utils.responses import ModelJSONResponse, select_fields
+from app.utils.streaming import ndjson_events, ndjson_stream
 
 router = APIRouter()
 
+# Echoes of the submitted resume, left out of compact responses
+COMPACT_EXCLUDE = {"original_text", "original_latex"}
+
 
 @router.post("/optimize", response_model=OptimizeResponse)
 async def optimize_resume_endpoint(
     resume_text: str = Form(""),
     jd_text: str = Form(...),
+    include_llm_analysis: bool = Form(True),
+    bypass_llm_cache: bool = Form(False),
+    analysis_id: str = Form(""),
+    compact: bool = Form(False),
+    fields: str = Form(""),
+    include_timings: bool = Form(False),
 ):
-    raw_latex = resume_text if is_latex(resume_text) else None
+    include, exclude = select_fields(compact, fields, COMPACT_EXCLUDE)
+    result = await _run_optimization(
+        resume_text, jd_text, include_llm_analysis, bypass_llm_cache, analysis_id,
+    )
+    extra = {"timings": timing.current_breakdown()} if include_timings else None
+    return ModelJSONResponse(result, include=include, exclude=exclude, extra=extra)
+
+
+@router.post("/optimize/stream")
+async def optimize_resume_stream(
+    resume_text: str = Form(""),
+    jd_text: str = Form(...),
+    include_llm_analysis: bool = Form(True),
+    bypass_llm_cache: bool = Form(False),
+    analysis_id: str = Form(""),
+    compact: bool = Form(False),
+    fields: str = Form(""),
+):
+    """Same as /optimize, but streams LLM fields (analysis and rewrites) as NDJSON."""
+    include, exclude = select_fields(compact, fields, COMPACT_EXCLUDE)
+    return ndjson_stream(lambda partial: _run_optimization(
+        resume_text, jd_text, include_llm_analysis, bypass_llm_cache, analysis_id,
+        on_analysis_field=partial("analysis"),
+        on_optimization_field=partial("optimization"),
+    ), include=include, exclude=exclude)
 
-    # Run full analysis first
-    parsed_resume = parse_resume(text=resume_text)
-    parsed_jd = parse_jd(jd_text)
 
-    keyword_score, keyword_results = compute_keyword_score(parsed_resume, parsed_jd)
-    semantic_score, semantic_results = compute_semantic_score(parsed_resume, parsed_jd)
-    structure_score, structure_results = compute_structure_score(parsed_resume)
-    overall_score = compute_overall_score(keyword_score, semantic_score, structure_score)
+@router.post("/optimize/jobs", status_code=202)
+async def submit_optimize_job(
+    resume_text: str = Form(""),
+    jd_text: str = Form(...),
+    include_llm_analysis: bool = Form(True),
+    bypass_llm_cache: bool = Form(False),
+    analysis_id: str = Form(""),
+):
+    """Queue an /optimize run and return its job id without waiting for the LLM calls."""
+    queue = _require_job_queue()
+    job_id = await queue.submit({
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "include_llm_analysis": include_llm_analysis,
+        "bypass_llm_cache": bypass_llm_cache,
+        "analysis_id": analysis_id,
+    })
+    return {"job_id": job_id, "status": "queued"}
 
-    llm_analysis = await analyze_with_llm(
-        resume_text=parsed_resume.raw_text,
-        jd_text=jd_text,
-        keyword_score=keyword_score,
-        semantic_score=semantic_score,
-        structure_score=structure_score,
-    )
 
-    suggestions = generate_suggestions(keyword_results, structure_results, semantic_results, llm_analysis)
-
-    analysis = ATSAnalysisResponse(
-        overall_score=overall_score,
-        keyword_score=keyword_score,
-        semantic_score=semantic_score,
-        structure_score=structure_score,
-        recruiter_status=get_recruiter_status(overall_score),
-        rank_estimate=get_rank_estimate(overall_score),
-        keyword_results=keyword_results,
-        semantic_results=semantic_results,
-        structure_results=structure_results,
-        parsed_resume=parsed_resume,
-        parsed_jd=parsed_jd,
-        llm_analysis=llm_analysis,
-        suggestions=suggestions,
-        analysis_id=str(uuid.uuid4())[:8],
-        analyzed_at=datetime.utcnow(),
-    )
+@router.get("/optimize/jobs/{job_id}")
+async def get_optimize_job(job_id: str):
+    job = await asyncio.to_thread(_require_job_queue().store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
 
-    # Run optimization
-    result = await optimize_resume(
-        resume_text=parsed_resume.raw_text,
+
+@router.get("/optimize/jobs/{job_id}/stream")
+async def stream_optimize_job(job_id: str):
+    """Stream ``{"type": "status"}`` lines as the job moves through the queue, then its result or error."""
+    queue = _require_job_queue()
+    job = await asyncio.to_thread(queue.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def events():
+        nonlocal job
+        last_status = None
+        while job is not None:
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield {"type": "status", "status": last_status, "attempts": job["attempts"]}
+            if job["status"] in FINISHED:
+                if job["result"] is not None:
+                    yield {"type": "result", "data": job["result"]}
+                else:
+                    yield {"type": "error", "message": job["error"]}
+                return
+            await queue.wait_for_change(job_id, timeout=1.0)
+            job = await asyncio.to_thread(queue.store.get, job_id)
+        yield {"type": "error", "message": "Job expired"}
+
+    return ndjson_events(events())
+
+
+def _require_job_queue():
+    queue = get_job_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Optimization jobs are disabled")
+    return queue
+
+
+async def run_optimization_job(params: dict) -> dict:
+    """Job queue handler: one /optimize run from stored form parameters."""
+    result = await _run_optimization(**params)
+    return result.model_dump(mode="json")
+
+
+async def _run_optimization(
+    resume_text: str,
+    jd_text: str,
+    include_llm_analysis: bool,
+    bypass_llm_cache: bool,
+    analysis_id: str = "",
+    on_analysis_field: FieldCallback | None = None,
+    on_optimization_field: FieldCallback | None = None,
+) -> OptimizeResponse:
+    raw_latex = resume_text if is_latex(resume_text) else None
+
+    # Reuse the /analyze result for these inputs while it is retained
+    analysis = recall_analysis(analysis_id, resume_text, jd_text) if analysis_id else None
+    if analysis is not None:
+        if on_analysis_field is not None and analysis.llm_analysis is not None:
+            replay_fields(analysis.llm_analysis.model_dump(), on_analysis_field)
+        return await optimize_resume(
+            resume_text=analysis.parsed_resume.raw_text,
+            jd_text=jd_text,
+            analysis=analysis,
+            raw_latex=raw_latex,
+            latex_map=get_latex_map(raw_latex) if raw_latex else None,
+            bypass_cache=bypass_llm_cache,
+            on_field=on_optimization_field,
+        )
+
+    # Deterministic layers first (the LaTeX map is parsed here once and cached),
+    # with the analysis prompt's JD prefix registered meanwhile
+    prefix_task = asyncio.create_task(prepare_analysis_prefix(jd_text)) if include_llm_analysis else None
+    scored = await run_scoring(resume_text, jd_text)
+    latex_map = get_latex_map(raw_latex) if raw_latex else None
+    analysis = build_analysis(scored)
+
+    # The optimization prompt only needs the deterministic results, so it is
+    # under way before the analysis call waits for its prefix. OptimizeResponse
+    # doesn't embed the analysis: /optimize/stream sends its fields as partial
+    # events, and every path leaves it in the LLM cache for a following /analyze
+    optimization = asyncio.create_task(optimize_resume(
+        resume_text=scored.parsed_resume.raw_text,
         jd_text=jd_text,
         analysis=analysis,
         raw_latex=raw_latex,
-    )
-
-    return result
+        latex_map=latex_map,
+        bypass_cache=bypass_llm_cache,
+        on_field=on_optimization_field,
+    ))
+    if prefix_task is None:
+        return await optimization
+    try:
+        await prefix_task
+        await analyze_with_llm(
+            resume_text=scored.parsed_resume.raw_text,
+            jd_text=jd_text,
+            keyword_score=scored.keyword_score,
+            semantic_score=scored.semantic_score,
+            structure_score=scored.structure_score,
+            bypass_cache=bypass_llm_cache,
+            on_field=on_analysis_field,
+            sections=scored.parsed_resume.sections,
+            keyword_results=scored.keyword_results,
+        )
+    except BaseException:
+        optimization.cancel()
+        raise
+    return await optimization
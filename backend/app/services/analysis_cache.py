@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.config import get_settings
+from app.models.schemas import ATSAnalysisResponse
+from app.services import keyword_matcher
+from app.services.jd_parser import REQUIRED_KEYWORD_BOOST
+from app.services.llm_analyzer import ANALYSIS_PROMPT_VERSION
+from app.services.score_aggregator import OVERALL_WEIGHTS
+from app.services.semantic_scorer import MODEL_NAME, SECTION_WEIGHTS
+from app.services.structure_scorer import ACCEPTABLE_WORD_RANGE, IDEAL_WORD_RANGE, STRUCTURE_POINTS
+from app.utils.cache import CacheBackend, CacheStats, MemoryCache, SQLiteCache, TieredCache
+from app.utils.constants import EXPERIENCE_LEVELS, SECTION_HEADERS
+from app.utils.variations import VARIATIONS
+
+logger = logging.getLogger(__name__)
+
+# Bump when a scoring layer changes in a way the data below doesn't capture
+PIPELINE_VERSION = "1"
+
+
+@dataclass
+class AnalysisCacheStats(CacheStats):
+    saved_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {**super().as_dict(), "saved_seconds": round(self.saved_seconds, 3)}
+
+
+analysis_cache_stats = AnalysisCacheStats()
+_stats_lock = threading.Lock()
+
+_cache: CacheBackend | None = None
+
+
+def get_analysis_cache() -> CacheBackend | None:
+    global _cache
+    settings = get_settings()
+    if not settings.analysis_cache_enabled:
+        return None
+    if _cache is None:
+        memory = MemoryCache(
+            settings.analysis_cache_max_entries,
+            settings.analysis_cache_ttl_seconds,
+            max_bytes=settings.analysis_cache_max_bytes,
+        )
+        if settings.analysis_cache_path:
+            _cache = TieredCache(memory, SQLiteCache(
+                settings.analysis_cache_path,
+                settings.analysis_cache_max_entries * 10,
+                settings.analysis_cache_ttl_seconds,
+                table="analyses",
+            ))
+        else:
+            _cache = memory
+    return _cache
+
+
+@lru_cache
+def pipeline_stamp() -> str:
+    """Digest of everything besides the inputs that decides an analysis.
+
+    Covers the embedding model, the taxonomies, the scoring weights and
+    thresholds, and the LLM model, prompt version and prompt budgets, so
+    changing any of them misses old entries.
+    """
+    settings = get_settings()
+    parts = {
+        "pipeline": PIPELINE_VERSION,
+        "embedding_model": MODEL_NAME,
+        "taxonomy": [SECTION_HEADERS, EXPERIENCE_LEVELS, VARIATIONS],
+        "weights": [OVERALL_WEIGHTS, SECTION_WEIGHTS],
+        "keyword": [
+            keyword_matcher.VARIATION_MATCH_SCORE,
+            keyword_matcher.FUZZY_MIN_RATIO,
+            keyword_matcher.FUZZY_SCORE_FACTOR,
+            keyword_matcher.PARTIAL_MIN_RATIO,
+            keyword_matcher.PARTIAL_SCORE_FACTOR,
+            keyword_matcher.CATEGORY_WEIGHTS,
+            REQUIRED_KEYWORD_BOOST,
+        ],
+        "structure": [STRUCTURE_POINTS, IDEAL_WORD_RANGE, ACCEPTABLE_WORD_RANGE],
+        "llm": [settings.llm_model, ANALYSIS_PROMPT_VERSION],
+        # The budgets decide which resume and JD sections the analysis prompt keeps;
+        # the prefix cache settings can raise the JD budget (see analysis_prefix)
+        "llm_prompt": [
+            settings.llm_prompt_resume_tokens,
+            settings.llm_prompt_jd_tokens,
+            settings.llm_prefix_cache_enabled,
+            settings.llm_prefix_cache_min_tokens,
+        ],
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_input(text: str) -> str:
+    """Drop differences that never change a result: Unicode form, line endings and edge whitespace."""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.strip().split("\n"))
+
+
+def analysis_cache_key(resume_text: str, jd_text: str, include_llm_analysis: bool) -> str:
+    digest = hashlib.sha256()
+    for part in (pipeline_stamp(), normalize_input(resume_text), normalize_input(jd_text), str(include_llm_analysis)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached_analysis(key: str) -> ATSAnalysisResponse | None:
+    cache = get_analysis_cache()
+    if cache is None:
+        return None
+    entry = cache.get(key)
+    with _stats_lock:
+        if entry is None:
+            analysis_cache_stats.misses += 1
+            return None
+        elapsed, analysis_json = entry
+        analysis_cache_stats.hits += 1
+        analysis_cache_stats.saved_seconds += elapsed
+    return ATSAnalysisResponse.model_validate_json(analysis_json)
+
+
+def store_analysis(key: str, analysis: ATSAnalysisResponse, elapsed: float) -> None:
+    """Cache a finished analysis with the time it took, which each later hit counts as saved."""
+    cache = get_analysis_cache()
+    if cache is None:
+        return
+    try:
+        # Stored serialized: the byte budget measures it and hits can't share a mutable object
+        cache.set(key, (elapsed, analysis.model_dump_json()))
+    except Exception as e:
+        logger.warning(f"Could not cache analysis: {e}")
@@ -0,0 +1,200 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from app.models.schemas import (
+    ATSAnalysisResponse, KeywordMatchResult, LLMAnalysis,
+    ParsedJD, ParsedResume, SemanticResult, StructureResult,
+)
+from app.services.resume_parser import parse_resume
+from app.services.jd_parser import parse_jd
+from app.services.keyword_matcher import compute_keyword_score
+from app.services.semantic_scorer import compute_semantic_score, compute_semantic_scores
+from app.services.structure_scorer import compute_structure_score
+from app.services.score_aggregator import compute_overall_score, get_recruiter_status, get_rank_estimate
+from app.services.suggestion_engine import generate_suggestions
+from app.utils import timing
+
+# Runs the model-bound steps (KeyBERT, sentence encoding) next to the pure-Python
+# layers; both models release the GIL while they compute
+_layer_executor: ThreadPoolExecutor | None = None
+
+
+def _get_layer_executor() -> ThreadPoolExecutor:
+    global _layer_executor
+    if _layer_executor is None:
+        _layer_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scoring-layer")
+    return _layer_executor
+
+
+def _parse_jd_until(jd_text: str) -> tuple[ParsedJD, float]:
+    return parse_jd(jd_text), time.perf_counter()
+
+
+@dataclass
+class ScoredResume:
+    """Output of the deterministic layers, i.e. everything except the LLM."""
+    parsed_resume: ParsedResume
+    parsed_jd: ParsedJD
+    keyword_score: int
+    keyword_results: list[KeywordMatchResult]
+    semantic_score: int
+    semantic_results: SemanticResult
+    structure_score: int
+    structure_results: StructureResult
+    overall_score: int
+
+
+def score_resume(
+    resume_text: str,
+    jd_text: str,
+    parsed_jd: ParsedJD | None = None,
+    jd_embeddings: np.ndarray | None = None,
+) -> ScoredResume:
+    """Run the deterministic layers, overlapping the independent ones.
+
+    JD parsing runs alongside resume parsing and structure scoring, and the
+    semantic encode runs alongside keyword matching, so the wall time tracks
+    the slowest branch rather than the sum of the layers. Callers scoring many
+    resumes against one JD pass it parsed (and encoded).
+    """
+    executor = _get_layer_executor()
+    started = time.perf_counter()
+    jd_future = timing.submit(executor, _parse_jd_until, jd_text) if parsed_jd is None else None
+
+    parsed_resume = parse_resume(text=resume_text)
+    parsed_at = time.perf_counter()
+
+    # Layer 3: Structure scoring (resume only)
+    structure_score, structure_results = compute_structure_score(parsed_resume)
+
+    if jd_future is not None:
+        parsed_jd, jd_parsed_at = jd_future.result()
+        parsed_at = max(parsed_at, jd_parsed_at)
+    # Until both inputs are parsed; resume_parse and jd_parse are its two branches
+    timing.record("parse", parsed_at - started)
+
+    # Layer 2: Semantic similarity, in flight while keywords are matched
+    semantic_future = timing.submit(executor, compute_semantic_score, parsed_resume, parsed_jd, jd_embeddings)
+
+    # Layer 1: Keyword matching
+    keyword_score, keyword_results = compute_keyword_score(parsed_resume, parsed_jd)
+
+    semantic_score, semantic_results = semantic_future.result()
+
+    overall_score = compute_overall_score(keyword_score, semantic_score, structure_score)
+
+    return ScoredResume(
+        parsed_resume=parsed_resume,
+        parsed_jd=parsed_jd,
+        keyword_score=keyword_score,
+        keyword_results=keyword_results,
+        semantic_score=semantic_score,
+        semantic_results=semantic_results,
+        structure_score=structure_score,
+        structure_results=structure_results,
+        overall_score=overall_score,
+    )
+
+
+def score_batch(
+    resume_texts: list[str],
+    parsed_jd: ParsedJD,
+    jd_embeddings: np.ndarray | None = None,
+) -> list[ScoredResume | Exception]:
+    """Score several resumes against one parsed JD.
+
+    The semantic layer encodes all resumes in one batch, in flight while the
+    keyword and structure layers run. A resume that fails to score yields its
+    exception in place of a result, so one bad input doesn't sink the batch.
+    """
+    parsed: list[ParsedResume | Exception] = []
+    for text in resume_texts:
+        try:
+            parsed.append(parse_resume(text=text))
+        except Exception as e:
+            parsed.append(e)
+
+    valid = [p for p in parsed if not isinstance(p, Exception)]
+    semantic_future = timing.submit(_get_layer_executor(), compute_semantic_scores, valid, parsed_jd, jd_embeddings)
+
+    partial: list[tuple | Exception] = []
+    for parsed_resume in parsed:
+        if isinstance(parsed_resume, Exception):
+            partial.append(parsed_resume)
+            continue
+        try:
+            keyword_score, keyword_results = compute_keyword_score(parsed_resume, parsed_jd)
+            structure_score, structure_results = compute_structure_score(parsed_resume)
+            partial.append((parsed_resume, keyword_score, keyword_results, structure_score, structure_results))
+        except Exception as e:
+            partial.append(e)
+
+    semantic = iter(semantic_future.result())
+    results: list[ScoredResume | Exception] = []
+    for item, parsed_resume in zip(partial, parsed):
+        if not isinstance(parsed_resume, Exception):
+            semantic_score, semantic_results = next(semantic)
+        if isinstance(item, Exception):
+            results.append(item)
+            continue
+        parsed_resume, keyword_score, keyword_results, structure_score, structure_results = item
+        results.append(ScoredResume(
+            parsed_resume=parsed_resume,
+            parsed_jd=parsed_jd,
+            keyword_score=keyword_score,
+            keyword_results=keyword_results,
+            semantic_score=semantic_score,
+            semantic_results=semantic_results,
+            structure_score=structure_score,
+            structure_results=structure_results,
+            overall_score=compute_overall_score(keyword_score, semantic_score, structure_score),
+        ))
+    return results
+
+
+def compact_summary(scored: ScoredResume) -> dict:
+    """The per-resume line of a batch: scores and the required keywords that are missing."""
+    return {
+        "name": scored.parsed_resume.contact.name,
+        "overall_score": scored.overall_score,
+        "keyword_score": scored.keyword_score,
+        "semantic_score": scored.semantic_score,
+        "structure_score": scored.structure_score,
+        "recruiter_status": get_recruiter_status(scored.overall_score),
+        "missing_required": [
+            r.keyword for r in scored.keyword_results
+            if not r.found and r.category == "required"
+        ],
+    }
+
+
+def build_analysis(scored: ScoredResume, llm_analysis: LLMAnalysis | None = None) -> ATSAnalysisResponse:
+    suggestions = generate_suggestions(
+        keyword_results=scored.keyword_results,
+        structure_results=scored.structure_results,
+        semantic_results=scored.semantic_results,
+        llm_analysis=llm_analysis,
+    )
+
+    return ATSAnalysisResponse(
+        overall_score=scored.overall_score,
+        keyword_score=scored.keyword_score,
+        semantic_score=scored.semantic_score,
+        structure_score=scored.structure_score,
+        recruiter_status=get_recruiter_status(scored.overall_score),
+        rank_estimate=get_rank_estimate(scored.overall_score),
+        keyword_results=scored.keyword_results,
+        semantic_results=scored.semantic_results,
+        structure_results=scored.structure_results,
+        parsed_resume=scored.parsed_resume,
+        parsed_jd=scored.parsed_jd,
+        llm_analysis=llm_analysis,
+        suggestions=suggestions,
+        analysis_id=str(uuid.uuid4())[:8],
+        analyzed_at=datetime.utcnow(),
+    )
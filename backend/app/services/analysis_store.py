@@ -0,0 +1,39 @@
+import hashlib
+
+from app.config import get_settings
+from app.models.schemas import ATSAnalysisResponse
+from app.utils.cache import MemoryCache
+
+_store: MemoryCache | None = None
+
+
+def _get_store() -> MemoryCache:
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = MemoryCache(settings.analysis_store_max_entries, settings.analysis_store_ttl_seconds)
+    return _store
+
+
+def _inputs_hash(resume_text: str, jd_text: str) -> str:
+    digest = hashlib.sha256()
+    for part in (resume_text, jd_text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def remember_analysis(analysis: ATSAnalysisResponse, resume_text: str, jd_text: str) -> None:
+    """Keep an /analyze result so a following /optimize on the same inputs can reuse it."""
+    _get_store().set(analysis.analysis_id, (_inputs_hash(resume_text, jd_text), analysis))
+
+
+def recall_analysis(analysis_id: str, resume_text: str, jd_text: str) -> ATSAnalysisResponse | None:
+    """Return the retained analysis, or None if it expired or was made for other inputs."""
+    entry = _get_store().get(analysis_id)
+    if entry is None:
+        return None
+    inputs_hash, analysis = entry
+    if inputs_hash != _inputs_hash(resume_text, jd_text):
+        return None
+    return analysis
@@ -0,0 +1,70 @@
+import asyncio
+import heapq
+from typing import AsyncIterator
+
+from app.config import get_settings
+from app.services.scoring_pool import prepare_batch_jd, run_batch_scoring
+
+
+async def analyze_batch(
+    resume_texts: list[str],
+    jd_text: str,
+    resume_ids: list[str] | None = None,
+    top_k: int = 0,
+) -> AsyncIterator[dict]:
+    """Score many resumes against one JD and yield one compact event per resume.
+
+    The JD is parsed and encoded once; resumes are scored in chunks (one
+    batched semantic encode each) with up to ``batch_concurrency`` chunks in
+    flight, so results arrive in completion order rather than input order.
+    With ``top_k`` only the best ``top_k`` results are kept and yielded,
+    ranked, once every chunk is done. Failures are reported per resume. The
+    last event is ``{"type": "done", "count", "failed"}``.
+    """
+    settings = get_settings()
+    ids = [
+        resume_ids[i] if resume_ids and i < len(resume_ids) and resume_ids[i] else str(i)
+        for i in range(len(resume_texts))
+    ]
+    chunk_size = max(1, settings.batch_chunk_size)
+    chunks = [range(i, min(i + chunk_size, len(resume_texts))) for i in range(0, len(resume_texts), chunk_size)]
+    semaphore = asyncio.Semaphore(max(1, settings.batch_concurrency))
+
+    async def run_chunk(indices: range) -> tuple[range, list[dict] | Exception]:
+        async with semaphore:
+            try:
+                return indices, await run_batch_scoring([resume_texts[i] for i in indices], jd_text)
+            except Exception as e:
+                return indices, e
+
+    await prepare_batch_jd(jd_text)
+
+    top: list[tuple[int, int, dict]] = []
+    failed = 0
+    tasks = [asyncio.create_task(run_chunk(indices)) for indices in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, summaries = await next_done
+            if isinstance(summaries, Exception):
+                summaries = [{"error": str(summaries)} for _ in indices]
+
+            for index, summary in zip(indices, summaries):
+                if "error" in summary:
+                    failed += 1
+                    yield {"type": "error", "id": ids[index], "index": index, "message": summary["error"]}
+                    continue
+                event = {"type": "result", "id": ids[index], "index": index, **summary}
+                if top_k <= 0:
+                    yield event
+                elif len(top) < top_k:
+                    heapq.heappush(top, (event["overall_score"], -index, event))
+                else:
+                    heapq.heappushpop(top, (event["overall_score"], -index, event))
+    finally:
+        # The client went away (or the generator was closed early): stop queued chunks
+        for task in tasks:
+            task.cancel()
+
+    for rank, (_, _, event) in enumerate(sorted(top, key=lambda t: (-t[0], -t[1])), start=1):
+        yield {**event, "rank": rank}
+    yield {"type": "done", "count": len(resume_texts), "failed": failed}
@@ -2,6 +2,10 @@ import re
 from app.models.schemas import ParsedJD, KeywordWithWeight
 from app.utils.text_processing import clean_text
 from app.utils.constants import EXPERIENCE_LEVELS
+from app.utils.timing import traced
+
+# Extraction weight multiplier for keywords found in the JD's required sections
+REQUIRED_KEYWORD_BOOST = 1.5
 
 
 def extract_jd_sections(text: str) -> dict[str, str]:
@@ -72,7 +76,9 @@ def _get_keybert():
     if _kw_model is None:
         try:
             from keybert import KeyBERT
-            _kw_model = KeyBERT(model="all-MiniLM-L6-v2")
+            from app.services.semantic_scorer import MODEL_NAME, _get_model
+            # Share the semantic scorer's sentence transformer instead of loading a second copy
+            _kw_model = KeyBERT(model=_get_model() or MODEL_NAME)
         except Exception:
             _kw_model = None
     return _kw_model
@@ -93,6 +99,7 @@ def _fallback_extract_keywords(text: str) -> list[KeywordWithWeight]:
     ]
 
 
+@traced("keybert")
 def extract_keywords_from_jd(text: str) -> list[KeywordWithWeight]:
     kw_model = _get_keybert()
     if kw_model is not None:
@@ -125,7 +132,7 @@ def classify_keywords(
         kw_lower = kw.keyword.lower()
         if kw_lower in required_text:
             kw.category = "required"
-            kw.weight = min(1.0, kw.weight * 1.5)
+            kw.weight = min(1.0, kw.weight * REQUIRED_KEYWORD_BOOST)
         elif kw_lower in preferred_text:
             kw.category = "preferred"
 
@@ -153,6 +160,7 @@ def extract_title(text: str) -> str:
     return ""
 
 
+@traced("jd_parse")
 def parse_jd(text: str) -> ParsedJD:
     text = clean_text(text)
     sections = extract_jd_sections(text)
@@ -3,6 +3,19 @@ from rapidfuzz import fuzz
 from app.models.schemas import KeywordMatchResult, ParsedResume, ParsedJD
 from app.utils.variations import get_all_variations
 from app.utils.text_processing import normalize_keyword
+from app.utils.metrics import fuzzy_comparisons
+from app.utils.timing import traced
+
+# A keyword found through one of its variations rather than verbatim
+VARIATION_MATCH_SCORE = 0.9
+# Fuzzy matches: the similarity ratio must reach the threshold and is scaled by the factor
+FUZZY_MIN_RATIO = 0.85
+FUZZY_SCORE_FACTOR = 0.9
+# Multi-word keywords matched against whole sections (token_set_ratio)
+PARTIAL_MIN_RATIO = 0.9
+PARTIAL_SCORE_FACTOR = 0.7
+# Keyword weight by JD category; anything else counts 1.0
+CATEGORY_WEIGHTS = {"required": 2.0, "preferred": 1.0}
 
 
 def match_keyword_in_text(
@@ -24,7 +37,7 @@ def match_keyword_in_text(
                 category="",
                 found=True,
                 match_type="exact" if var == keyword_lower else "variation",
-                match_score=1.0 if var == keyword_lower else 0.9,
+                match_score=1.0 if var == keyword_lower else VARIATION_MATCH_SCORE,
                 matched_text=var,
                 location_in_resume=location,
             )
@@ -38,15 +51,16 @@ def match_keyword_in_text(
         if ratio > best_score:
             best_score = ratio
             best_match = word
+    fuzzy_comparisons.inc(len(words_in_resume))
 
-    if best_score >= 0.85:
+    if best_score >= FUZZY_MIN_RATIO:
         location = _find_section(best_match, sections)
         return KeywordMatchResult(
             keyword=keyword,
             category="",
             found=True,
             match_type="fuzzy",
-            match_score=round(best_score * 0.9, 2),
+            match_score=round(best_score * FUZZY_SCORE_FACTOR, 2),
             matched_text=best_match,
             location_in_resume=location,
         )
@@ -54,14 +68,15 @@ def match_keyword_in_text(
     # 3. Partial match using token_set_ratio for multi-word keywords
     if len(keyword_lower.split()) > 1:
         for section_name, section_text in sections.items():
+            fuzzy_comparisons.inc()
             ratio = fuzz.token_set_ratio(keyword_lower, section_text.lower()) / 100.0
-            if ratio >= 0.9:
+            if ratio >= PARTIAL_MIN_RATIO:
                 return KeywordMatchResult(
                     keyword=keyword,
                     category="",
                     found=True,
                     match_type="fuzzy",
-                    match_score=round(ratio * 0.7, 2),
+                    match_score=round(ratio * PARTIAL_SCORE_FACTOR, 2),
                     matched_text=keyword_lower,
                     location_in_resume=section_name,
                 )
@@ -85,6 +100,7 @@ def _find_section(text: str, sections: dict[str, str]) -> str:
     return "general"
 
 
+@traced("keyword")
 def compute_keyword_score(
     parsed_resume: ParsedResume,
     parsed_jd: ParsedJD,
@@ -104,7 +120,7 @@ def compute_keyword_score(
     total_weight = 0.0
     weighted_score = 0.0
     for r in results:
-        weight = 2.0 if r.category == "required" else 1.0
+        weight = CATEGORY_WEIGHTS.get(r.category, 1.0)
         total_weight += weight
         weighted_score += r.match_score * weight
 
@@ -1,43 +1,251 @@
-from app.services.latex_parser import LatexResumeMap
+import difflib
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 
+from app.services.latex_parser import LatexResumeMap, LatexSection
+from app.utils.timing import traced
 
-def assemble_optimized_latex(
+logger = logging.getLogger(__name__)
+
+ORIGINAL = 0
+ADDED = 1
+
+
+@dataclass(frozen=True)
+class LatexEdit:
+    """Replace ``original[start:end]`` with ``text`` (``start == end`` inserts)."""
+    start: int
+    end: int
+    text: str
+    label: str = ""
+
+
+@dataclass
+class _Piece:
+    buffer: int
+    offset: int
+    length: int
+    # Span of the original document this piece stands in for
+    source_start: int
+    source_end: int
+    batch: int = -1
+
+
+class EditConflictError(ValueError):
+    def __init__(self, edit: LatexEdit, reason: str):
+        self.edit = edit
+        super().__init__(f"Edit {edit.label or (edit.start, edit.end)} conflicts: {reason}")
+
+
+class LatexPieceTable:
+    """Piece table over the original ``.tex`` source.
+
+    Edits are addressed in original-document offsets, so batches from later
+    optimization rounds can target the same bullets and sections again: an
+    edit covering exactly the span of an earlier one supersedes it, any other
+    overlap with an edited span is a conflict. Applying an edit only splits one
+    piece; the document is materialised by a single join in ``render``.
+    """
+
+    def __init__(self, original: str):
+        self.original = original
+        self._added: list[str] = []
+        self._added_length = 0
+        self._batches = 0
+        self._pieces: list[_Piece] = []
+        self._starts: list[int] = []
+        if original:
+            self._insert_piece(0, _Piece(ORIGINAL, 0, len(original), 0, len(original)))
+
+    @classmethod
+    def from_map(cls, latex_map: LatexResumeMap) -> "LatexPieceTable":
+        return cls(latex_map.raw_latex)
+
+    @property
+    def edits(self) -> list[LatexEdit]:
+        added = "".join(self._added)
+        return [
+            LatexEdit(p.source_start, p.source_end, added[p.offset:p.offset + p.length])
+            for p in self._pieces
+            if p.buffer == ADDED
+        ]
+
+    def apply(self, edits: list[LatexEdit], skip_conflicts: bool = False) -> list[LatexEdit]:
+        """Apply a batch of non-overlapping edits.
+
+        Conflicting batches are rolled back and raise ``EditConflictError``,
+        unless ``skip_conflicts`` is set, in which case the conflicting edits
+        are left out and returned.
+        """
+        self._batches += 1
+        batch = self._batches
+        pieces, starts = self._pieces[:], self._starts[:]
+        skipped: list[LatexEdit] = []
+
+        for edit in edits:
+            try:
+                self._apply_one(edit, batch)
+            except EditConflictError:
+                if not skip_conflicts:
+                    self._pieces, self._starts = pieces, starts
+                    raise
+                skipped.append(edit)
+
+        return skipped
+
+    def render(self) -> str:
+        added = "".join(self._added)
+        original = self.original
+        return "".join(
+            original[p.offset:p.offset + p.length] if p.buffer == ORIGINAL
+            else added[p.offset:p.offset + p.length]
+            for p in self._pieces
+        )
+
+    def unified_diff(
+        self,
+        fromfile: str = "original.tex",
+        tofile: str = "optimized.tex",
+        context: int = 3,
+    ) -> str:
+        return "".join(difflib.unified_diff(
+            self.original.splitlines(keepends=True),
+            self.render().splitlines(keepends=True),
+            fromfile=fromfile,
+            tofile=tofile,
+            n=context,
+        ))
+
+    def _apply_one(self, edit: LatexEdit, batch: int) -> None:
+        start, end = edit.start, edit.end
+        if not 0 <= start <= end <= len(self.original):
+            raise EditConflictError(edit, "span is outside the document")
+
+        # An edit of exactly the same span replaces an earlier round's edit
+        for j in range(bisect_left(self._starts, start), bisect_right(self._starts, start)):
+            piece = self._pieces[j]
+            if piece.buffer == ADDED and piece.source_end == end:
+                if piece.batch == batch:
+                    raise EditConflictError(edit, "span is edited twice in one batch")
+                self._pieces[j] = self._added_piece(edit, batch)
+                return
+
+        idx = bisect_right(self._starts, start) - 1
+        if idx < 0:
+            # Only an empty document has no piece at or before the edit
+            if start != end:
+                raise EditConflictError(edit, "span overlaps an edited region")
+            self._insert_piece(0, self._added_piece(edit, batch))
+            return
+
+        piece = self._pieces[idx]
+        if piece.buffer == ADDED and piece.source_start < start < piece.source_end:
+            raise EditConflictError(edit, "span overlaps an edited region")
+
+        if start == end and (piece.buffer == ADDED or start in (piece.source_start, piece.source_end)):
+            # Pure insertion at a piece boundary
+            at = idx if start == piece.source_start else idx + 1
+            self._insert_piece(at, self._added_piece(edit, batch))
+            return
+
+        if piece.buffer != ORIGINAL or end > piece.source_end:
+            raise EditConflictError(edit, "span overlaps an edited region")
+
+        # Split the original piece around the edit
+        replacement: list[_Piece] = []
+        if start > piece.source_start:
+            replacement.append(_Piece(
+                ORIGINAL, piece.source_start, start - piece.source_start,
+                piece.source_start, start,
+            ))
+        replacement.append(self._added_piece(edit, batch))
+        if end < piece.source_end:
+            replacement.append(_Piece(
+                ORIGINAL, end, piece.source_end - end, end, piece.source_end,
+            ))
+        self._pieces[idx:idx + 1] = replacement
+        self._starts[idx:idx + 1] = [p.source_start for p in replacement]
+
+    def _added_piece(self, edit: LatexEdit, batch: int) -> _Piece:
+        piece = _Piece(ADDED, self._added_length, len(edit.text), edit.start, edit.end, batch)
+        self._added.append(edit.text)
+        self._added_length += len(edit.text)
+        return piece
+
+    def _insert_piece(self, index: int, piece: _Piece) -> None:
+        self._pieces.insert(index, piece)
+        self._starts.insert(index, piece.source_start)
+
+
+def _section_body_edit(
+    original_map: LatexResumeMap, section: LatexSection, content: str, label: str,
+) -> LatexEdit | None:
+    spans = original_map.line_spans
+    header = section.start_line - 1
+    last = min(section.end_line, len(spans)) - 1
+    if header >= len(spans):
+        return None
+
+    # Keep the \section line, replace everything after it up to the last body line
+    start = spans[header][1]
+    end = spans[last][1] if last > header else start
+    return LatexEdit(start, end, "\n" + content, label)
+
+
+def build_latex_edits(
     original_map: LatexResumeMap,
     optimized_about: str | None = None,
     optimized_skills: str | None = None,
     optimized_bullets: dict[int, str] | None = None,
-) -> str:
-    lines = original_map.raw_latex.splitlines()
+) -> list[LatexEdit]:
+    edits: list[LatexEdit] = []
+
+    if optimized_about and original_map.about_section:
+        edit = _section_body_edit(original_map, original_map.about_section, optimized_about, "about")
+        if edit:
+            edits.append(edit)
+
+    if optimized_skills and original_map.skills_section:
+        edit = _section_body_edit(original_map, original_map.skills_section, optimized_skills, "skills")
+        if edit:
+            edits.append(edit)
 
-    # Replace individual bullets by line number
     if optimized_bullets:
+        spans = original_map.line_spans
         for line_num, new_bullet in optimized_bullets.items():
             idx = line_num - 1  # line numbers are 1-indexed
-            if 0 <= idx < len(lines):
-                lines[idx] = new_bullet
+            if not 0 <= idx < len(spans):
+                continue
+            # Replace the bullet itself, keeping the line's indentation
+            start, end = spans[idx]
+            line = original_map.raw_latex[start:end]
+            start += len(line) - len(line.lstrip())
+            end -= len(line) - len(line.rstrip())
+            edits.append(LatexEdit(start, end, new_bullet.strip(), f"bullet:{line_num}"))
 
-    # Replace skills block if optimized
-    if optimized_skills and original_map.skills_section:
-        start = original_map.skills_section.start_line - 1
-        end = original_map.skills_section.end_line
-
-        # Keep the \section line, replace content
-        section_line = lines[start]
-        for i in range(start, min(end, len(lines))):
-            lines[i] = None  # type: ignore
+    return edits
 
-        # Reconstruct: section header + new content
-        lines[start] = section_line + "\n" + optimized_skills
 
-    # Replace about block if optimized
-    if optimized_about and original_map.about_section:
-        start = original_map.about_section.start_line - 1
-        end = original_map.about_section.end_line
+@traced("assemble")
+def assemble_optimized_latex(
+    original_map: LatexResumeMap,
+    optimized_about: str | None = None,
+    optimized_skills: str | None = None,
+    optimized_bullets: dict[int, str] | None = None,
+    table: LatexPieceTable | None = None,
+) -> str:
+    """Apply the optimized blocks to the original source and return the new document.
 
-        section_line = lines[start]
-        for i in range(start, min(end, len(lines))):
-            lines[i] = None  # type: ignore
+    Pass the ``table`` from a previous round to layer another batch of edits
+    on top of it; edits to the same bullet or section replace the earlier ones.
+    """
+    if table is None:
+        table = LatexPieceTable.from_map(original_map)
 
-        lines[start] = section_line + "\n" + optimized_about
+    edits = build_latex_edits(original_map, optimized_about, optimized_skills, optimized_bullets)
+    skipped = table.apply(edits, skip_conflicts=True)
+    for edit in skipped:
+        logger.warning(f"Skipped conflicting LaTeX edit: {edit.label}")
 
-    return "\n".join(line for line in lines if line is not None)
+    return table.render()
@@ -1,13 +1,32 @@
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import cached_property
+
+_LATEX_MAP_CACHE_SIZE = 32
+_latex_map_cache: OrderedDict[str, "LatexResumeMap"] = OrderedDict()
+# Called from request threads and the layer executor at once
+_latex_map_lock = threading.Lock()
+
+
+def _to_plain(latex: str) -> str:
+    # Imported lazily: resume_parser depends on this module for its LaTeX view.
+    from app.services.resume_parser import latex_to_plain
+    return latex_to_plain(latex)
 
 
 @dataclass
 class LatexBullet:
-    plain_text: str
+    content: str
     latex_text: str
     line_number: int
 
+    @cached_property
+    def plain_text(self) -> str:
+        return _to_plain(self.content)
+
 
 @dataclass
 class LatexExperienceEntry:
@@ -28,11 +47,14 @@ class LatexProjectEntry:
 @dataclass
 class LatexSection:
     name: str
-    plain_text: str
     latex_content: str
     start_line: int
     end_line: int
 
+    @cached_property
+    def plain_text(self) -> str:
+        return _to_plain(self.latex_content)
+
 
 @dataclass
 class LatexResumeMap:
@@ -48,6 +70,47 @@ class LatexResumeMap:
     skills_section: LatexSection | None = None
     about_section: LatexSection | None = None
 
+    @cached_property
+    def plain_text(self) -> str:
+        return _to_plain(self.raw_latex)
+
+    @property
+    def latex_sections(self) -> dict[str, str]:
+        return {s.name: s.latex_content for s in self.sections}
+
+    @cached_property
+    def line_spans(self) -> list[tuple[int, int]]:
+        """(start, end) character offsets of each line, excluding its line break."""
+        spans: list[tuple[int, int]] = []
+        offset = 0
+        for line in self.raw_latex.splitlines(keepends=True):
+            content = line.rstrip("\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+            spans.append((offset, offset + len(content)))
+            offset += len(line)
+        return spans
+
+
+def latex_source_hash(latex_source: str) -> str:
+    return hashlib.sha256(latex_source.encode("utf-8")).hexdigest()
+
+
+def get_latex_map(latex_source: str) -> LatexResumeMap:
+    """Return the LaTeX map for a source, reusing the parse of identical source."""
+    key = latex_source_hash(latex_source)
+    with _latex_map_lock:
+        latex_map = _latex_map_cache.get(key)
+        if latex_map is not None:
+            _latex_map_cache.move_to_end(key)
+            return latex_map
+
+    # Parsed outside the lock; two threads parsing the same source both get a valid map
+    latex_map = parse_latex_resume(latex_source)
+    with _latex_map_lock:
+        _latex_map_cache[key] = latex_map
+        if len(_latex_map_cache) > _LATEX_MAP_CACHE_SIZE:
+            _latex_map_cache.popitem(last=False)
+    return latex_map
+
 
 def parse_latex_resume(latex_source: str) -> LatexResumeMap:
     lines = latex_source.splitlines()
@@ -87,7 +150,6 @@ def parse_latex_resume(latex_source: str) -> LatexResumeMap:
                 latex_content = "\n".join(current_section_lines)
                 sections.append(LatexSection(
                     name=current_section_name,
-                    plain_text=latex_to_plain(latex_content),
                     latex_content=latex_content,
                     start_line=current_section_start + 1,
                     end_line=i,
@@ -107,7 +169,6 @@ def parse_latex_resume(latex_source: str) -> LatexResumeMap:
         latex_content = "\n".join(current_section_lines)
         sections.append(LatexSection(
             name=current_section_name,
-            plain_text=latex_to_plain(latex_content),
             latex_content=latex_content,
             start_line=current_section_start + 1,
             end_line=doc_end,
@@ -189,7 +250,7 @@ def _extract_experience_entries(
             item_match = re.search(r"\\resumeItem\{(.*?)\}", line, re.DOTALL)
             if item_match:
                 current_entry.bullets.append(LatexBullet(
-                    plain_text=latex_to_plain(item_match.group(1)),
+                    content=item_match.group(1),
                     latex_text=line.strip(),
                     line_number=i + 1,
                 ))
@@ -231,7 +292,7 @@ def _extract_project_entries(
                 entries.append(current_entry)
 
             current_entry = LatexProjectEntry(
-                name=latex_to_plain(proj_match.group(1)),
+                name=_to_plain(proj_match.group(1)),
                 latex_block="",
             )
             block_lines = [line]
@@ -240,7 +301,7 @@ def _extract_project_entries(
             item_match = re.search(r"\\resumeItem\{(.*?)\}", line, re.DOTALL)
             if item_match:
                 current_entry.bullets.append(LatexBullet(
-                    plain_text=latex_to_plain(item_match.group(1)),
+                    content=item_match.group(1),
                     latex_text=line.strip(),
                     line_number=i + 1,
                 ))
@@ -252,22 +313,138 @@ def _extract_project_entries(
     return entries
 
 
+# Comments, \verb, environment markers, other control sequences/escapes and
+# braces, tried in this order at each position.
+_LATEX_TOKEN_RE = re.compile(
+    r"%[^\n]*"
+    r"|\\verb\*?(?P<verb>[^a-zA-Z\s*])"
+    r"|\\(?P<kind>begin|end)\s*\{(?P<env>[^{}]*)\}"
+    r"|\\(?:[a-zA-Z@]+\*?|.)"
+    r"|[{}]",
+    re.DOTALL,
+)
+
+_VERBATIM_ENVS = {"verbatim", "verbatim*", "lstlisting", "minted", "comment"}
+
+# Macro definitions may hold half an environment, e.g. Jake's template's
+# \newcommand{\resumeItemListStart}{\begin{itemize}}, so their bodies are
+# checked for braces only.
+_DEFINING_COMMANDS = {
+    "\\newcommand", "\\newcommand*", "\\renewcommand", "\\renewcommand*",
+    "\\providecommand", "\\providecommand*", "\\newenvironment", "\\renewenvironment",
+    "\\def", "\\gdef", "\\edef", "\\xdef",
+}
+
+
+def _line_col(text: str, pos: int) -> tuple[int, int]:
+    line = text.count("\n", 0, pos) + 1
+    column = pos - (text.rfind("\n", 0, pos) + 1) + 1
+    return line, column
+
+
+def _find_structure_error(tex_content: str) -> tuple[str, int] | None:
+    """Scan braces and environments once; return the first error and its offset."""
+    brace_stack: list[int] = []
+    env_stack: list[tuple[str, int, int]] = []
+    # Brace depth of the macro definition being read, and whether its name may still follow
+    definition_depth: int | None = None
+    awaiting_name = False
+    pos = 0
+
+    while True:
+        match = _LATEX_TOKEN_RE.search(tex_content, pos)
+        if match is None:
+            break
+        start, pos = match.start(), match.end()
+        token = match.group(0)
+
+        if definition_depth is not None and len(brace_stack) == definition_depth and token != "{":
+            # \def\name or \newcommand\name: the unbraced name, then only groups belong to the definition
+            if awaiting_name and token.startswith("\\") and match.group("kind") is None:
+                awaiting_name = False
+                continue
+            definition_depth = None
+
+        if token in _DEFINING_COMMANDS:
+            definition_depth = len(brace_stack)
+            awaiting_name = True
+        elif token == "{":
+            if definition_depth is not None and len(brace_stack) == definition_depth:
+                awaiting_name = False
+            brace_stack.append(start)
+        elif token == "}":
+            if not brace_stack:
+                return "Unbalanced braces: '}' has no matching '{'", start
+            if env_stack and len(brace_stack) == env_stack[-1][2]:
+                name, env_start, _ = env_stack[-1]
+                line, column = _line_col(tex_content, env_start)
+                return (
+                    f"Unbalanced braces: '}}' closes a group opened before "
+                    f"\\begin{{{name}}} (line {line}, column {column})"
+                ), start
+            brace_stack.pop()
+        elif match.group("verb") is not None:
+            close = tex_content.find(match.group("verb"), pos)
+            if close == -1:
+                return "Unterminated \\verb", start
+            pos = close + 1
+        elif match.group("kind") is not None and definition_depth is not None:
+            continue
+        elif match.group("kind") == "begin":
+            name = match.group("env").strip()
+            if name in _VERBATIM_ENVS:
+                end_marker = f"\\end{{{name}}}"
+                close = tex_content.find(end_marker, pos)
+                if close == -1:
+                    return f"Unclosed environment \\begin{{{name}}}", start
+                pos = close + len(end_marker)
+            else:
+                env_stack.append((name, start, len(brace_stack)))
+        elif match.group("kind") == "end":
+            name = match.group("env").strip()
+            if not env_stack:
+                return f"\\end{{{name}}} has no matching \\begin", start
+            open_name, open_start, depth = env_stack.pop()
+            if open_name != name:
+                line, column = _line_col(tex_content, open_start)
+                return (
+                    f"Mismatched environments: \\end{{{name}}} closes "
+                    f"\\begin{{{open_name}}} (line {line}, column {column})"
+                ), start
+            if len(brace_stack) > depth:
+                return (
+                    f"Unbalanced braces: '{{' is not closed before \\end{{{name}}}"
+                ), brace_stack[-1]
+        # Comments, escapes (\{, \%, \\ ...) and other commands need no bookkeeping
+
+    if env_stack:
+        name, env_start, _ = env_stack[-1]
+        return f"Unclosed environment \\begin{{{name}}}", env_start
+    if brace_stack:
+        return "Unbalanced braces: '{' is never closed", brace_stack[-1]
+    return None
+
+
 def validate_latex_syntax(tex_content: str) -> dict:
-    errors = []
+    """Validate LaTeX structure in one linear pass.
 
-    open_count = tex_content.count("{")
-    close_count = tex_content.count("}")
-    if open_count != close_count:
-        errors.append(f"Unbalanced braces: {open_count} open, {close_count} close")
+    Braces and environments are tracked on stacks while comments, escaped
+    characters, ``\\verb`` and verbatim environments are skipped. Only the
+    first structural error is reported, with its 1-based line and column,
+    since anything after it is usually a knock-on effect.
+    """
+    errors = []
+    line = column = None
 
-    begins = re.findall(r"\\begin\{(\w+)\}", tex_content)
-    ends = re.findall(r"\\end\{(\w+)\}", tex_content)
-    if sorted(begins) != sorted(ends):
-        errors.append(f"Mismatched environments: begins={begins}, ends={ends}")
+    structure_error = _find_structure_error(tex_content)
+    if structure_error:
+        message, pos = structure_error
+        line, column = _line_col(tex_content, pos)
+        errors.append(f"{message} at line {line}, column {column}")
 
     if "\\begin{document}" not in tex_content:
         errors.append("Missing \\begin{document}")
     if "\\end{document}" not in tex_content:
         errors.append("Missing \\end{document}")
 
-    return {"valid": len(errors) == 0, "errors": errors}
+    return {"valid": len(errors) == 0, "errors": errors, "line": line, "column": column}
@@ -1,24 +1,25 @@
 import logging
-from app.models.schemas import LLMAnalysis
 from app.config import get_settings
-from app.utils.llm_helpers import parse_llm_json
+from app.models.schemas import LLMAnalysis, KeywordMatchResult
+from app.services.llm_client import get_llm_provider
+from app.services.llm_prefix_cache import get_prefix_registry
+from app.services.llm_gateway import get_llm_gateway, LLMQueueTimeout
+from app.services.prompt_builder import compact_jd, compact_resume, estimate_tokens
+from app.utils.json_stream import FieldCallback
 
 logger = logging.getLogger(__name__)
 
+# Bump when the analysis prompt changes so cached responses are not reused
+ANALYSIS_PROMPT_VERSION = "2"
 
-ANALYSIS_PROMPT = """You are an expert ATS analyst and career advisor. Analyze this resume against the job description.
-
-RESUME:
-{resume_text}
+# Instructions and the JD come first and don't depend on the resume, so the
+# formatted prefix is identical for every resume scored against one posting
+# and can be served from the provider's context cache.
+ANALYSIS_PREFIX = """You are an expert ATS analyst and career advisor. Analyze the resume that follows against this job description.
 
 JOB DESCRIPTION:
 {jd_text}
 
-QUANTITATIVE SCORES (already computed):
-- Keyword Match: {keyword_score}%
-- Semantic Similarity: {semantic_score}%
-- Structure Score: {structure_score}%
-
 Provide your analysis as JSON with these fields:
 {{
   "qualitative_fit": "strong_match" | "good_match" | "partial_match" | "weak_match",
@@ -45,7 +46,50 @@ Provide your analysis as JSON with these fields:
   "overall_recommendation": "1-2 paragraph actionable recommendation"
 }}
 
-Return ONLY the JSON object, no other text."""
+Return ONLY the JSON object, no other text.
+"""
+
+ANALYSIS_SUFFIX = """
+RESUME:
+{resume_text}
+
+QUANTITATIVE SCORES (already computed):
+- Keyword Match: {keyword_score}%
+- Semantic Similarity: {semantic_score}%
+- Structure Score: {structure_score}%"""
+
+ANALYSIS_PROMPT = ANALYSIS_PREFIX + ANALYSIS_SUFFIX
+
+
+_INSTRUCTION_TOKENS = estimate_tokens(ANALYSIS_PREFIX.format(jd_text=""))
+# compact_jd cuts at line boundaries, so it can land a little under its budget
+_PREFIX_BUDGET_MARGIN = 64
+
+
+def analysis_prefix(jd_text: str) -> str:
+    """Instructions plus the compacted JD.
+
+    With the context cache on, the JD budget is raised so that a long JD
+    fills the prefix past the provider's minimum cacheable size; with the
+    plain ``llm_prompt_jd_tokens`` budget the prefix would never reach it.
+    """
+    settings = get_settings()
+    budget = settings.llm_prompt_jd_tokens
+    if settings.llm_prefix_cache_enabled:
+        budget = max(budget, settings.llm_prefix_cache_min_tokens - _INSTRUCTION_TOKENS + _PREFIX_BUDGET_MARGIN)
+    return ANALYSIS_PREFIX.format(jd_text=compact_jd(jd_text, budget))
+
+
+async def prepare_analysis_prefix(jd_text: str) -> None:
+    """Register the JD prefix with the provider's context cache while scoring still runs."""
+    provider = get_llm_provider()
+    registry = get_prefix_registry()
+    if provider is None or registry is None:
+        return
+    try:
+        await registry.prepare(provider, analysis_prefix(jd_text))
+    except Exception as e:
+        logger.warning(f"Preparing the analysis prefix failed: {e}")
 
 
 async def analyze_with_llm(
@@ -54,28 +98,33 @@ async def analyze_with_llm(
     keyword_score: int,
     semantic_score: int,
     structure_score: int,
+    bypass_cache: bool = False,
+    on_field: FieldCallback | None = None,
+    sections: dict[str, str] | None = None,
+    keyword_results: list[KeywordMatchResult] | None = None,
 ) -> LLMAnalysis | None:
-    settings = get_settings()
-    if not settings.gemini_api_key:
+    if get_llm_provider() is None:
         logger.warning("No Gemini API key configured, skipping LLM analysis")
         return None
 
     try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
-
-        prompt = ANALYSIS_PROMPT.format(
-            resume_text=resume_text[:4000],
-            jd_text=jd_text[:3000],
+        prefix = analysis_prefix(jd_text)
+        prompt = ANALYSIS_SUFFIX.format(
+            resume_text=compact_resume(resume_text, sections, keyword_results),
             keyword_score=keyword_score,
             semantic_score=semantic_score,
             structure_score=structure_score,
         )
 
-        response = model.generate_content(prompt)
-        result = parse_llm_json(response.text)
+        gateway = get_llm_gateway()
+        if on_field is None:
+            result = await gateway.complete_json(
+                prompt, ANALYSIS_PROMPT_VERSION, bypass_cache=bypass_cache, prefix=prefix,
+            )
+        else:
+            result = await gateway.stream_json(
+                prompt, ANALYSIS_PROMPT_VERSION, on_field, bypass_cache=bypass_cache, prefix=prefix,
+            )
 
         if not result:
             logger.warning("Failed to parse LLM response")
@@ -94,6 +143,9 @@ async def analyze_with_llm(
             overall_recommendation=result.get("overall_recommendation", ""),
         )
 
+    except LLMQueueTimeout as e:
+        logger.warning(f"{e}, skipping LLM analysis")
+        return None
     except Exception as e:
         logger.error(f"LLM analysis failed: {e}")
         return None
@@ -0,0 +1,406 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import AsyncIterator, Protocol
+
+from app.config import get_settings
+from app.services.llm_prefix_cache import get_prefix_registry
+from app.utils.cache import CacheBackend, CacheStats, MemoryCache, SQLiteCache
+from app.services.prompt_builder import estimate_tokens
+from app.utils.metrics import llm_prompt_tokens, registry as metrics_registry
+from app.utils.timing import record, traced
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider(Protocol):
+    model_name: str
+
+    async def generate(self, prompt: str, timeout: float | None = None) -> str:
+        ...
+
+    def stream(self, prompt: str, timeout: float | None = None) -> AsyncIterator[str]:
+        ...
+
+
+class PrefixCachingProvider(LLMProvider, Protocol):
+    """A provider that can hold a prompt prefix in a server-side context cache.
+
+    ``create_cached_prefix`` returns a handle; passing it as ``cached_prefix``
+    makes ``prompt`` a continuation of the cached text.
+    """
+
+    async def create_cached_prefix(self, prefix: str, ttl: float) -> str:
+        ...
+
+    async def generate(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> str:
+        ...
+
+    def stream(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> AsyncIterator[str]:
+        ...
+
+
+class HedgeSlots(Protocol):
+    """Upstream capacity shared with the caller's concurrency cap, taken by hedges."""
+
+    async def try_acquire(self) -> bool:
+        """Take a slot if one is free right now, without waiting."""
+        ...
+
+    def release(self) -> None:
+        ...
+
+
+class GeminiProvider:
+    """Gemini client configured once and reused across requests."""
+
+    def __init__(self, api_key: str, model_name: str):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._genai = genai
+        self._model = genai.GenerativeModel(model_name)
+        # Cached content name -> (model bound to it, local expiry)
+        self._cached_models: dict[str, tuple[object, float]] = {}
+
+    async def create_cached_prefix(self, prefix: str, ttl: float) -> str:
+        from google.generativeai import caching
+
+        cached = await asyncio.to_thread(
+            caching.CachedContent.create,
+            model=self.model_name,
+            contents=[prefix],
+            ttl=timedelta(seconds=ttl),
+        )
+        now = time.monotonic()
+        self._cached_models = {
+            name: entry for name, entry in self._cached_models.items() if entry[1] > now
+        }
+        self._cached_models[cached.name] = (
+            self._genai.GenerativeModel.from_cached_content(cached), now + ttl,
+        )
+        return cached.name
+
+    async def generate(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> str:
+        # generate_content_async awaits the gRPC call instead of blocking the event loop
+        request_options = {"timeout": timeout} if timeout else None
+        response = await self._model_for(cached_prefix).generate_content_async(
+            prompt, request_options=request_options,
+        )
+        return response.text
+
+    async def stream(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> AsyncIterator[str]:
+        request_options = {"timeout": timeout} if timeout else None
+        response = await self._model_for(cached_prefix).generate_content_async(
+            prompt, stream=True, request_options=request_options,
+        )
+        async for chunk in response:
+            yield chunk.text
+
+    def _model_for(self, cached_prefix: str | None):
+        if cached_prefix is None:
+            return self._model
+        # KeyError here fails the attempt; the caller then drops the handle
+        return self._cached_models[cached_prefix][0]
+
+
+_provider: LLMProvider | None = None
+_response_cache: CacheBackend | None = None
+llm_cache_stats = CacheStats()
+
+
+def get_llm_provider() -> LLMProvider | None:
+    global _provider
+    if _provider is None:
+        settings = get_settings()
+        if settings.llm_provider == "standin":
+            _provider = _create_standin_provider()
+        elif settings.gemini_api_key:
+            try:
+                _provider = GeminiProvider(settings.gemini_api_key, settings.llm_model)
+            except Exception as e:
+                logger.error(f"Failed to configure Gemini client: {e}")
+            else:
+                if settings.llm_recordings_path:
+                    from app.services.llm_standin import RecordingProvider
+                    _provider = RecordingProvider(_provider, settings.llm_recordings_path)
+    return _provider
+
+
+def _create_standin_provider() -> LLMProvider:
+    from app.services.llm_fake import LatencyDistribution
+    from app.services.llm_standin import StandInLLMProvider, load_recordings
+
+    settings = get_settings()
+    recordings = load_recordings(settings.llm_recordings_path) if settings.llm_recordings_path else {}
+    logger.info(f"Using the stand-in LLM provider ({len(recordings)} recorded responses)")
+    return StandInLLMProvider(
+        recordings=recordings,
+        latency=LatencyDistribution.parse(settings.llm_standin_latency),
+        error_rate=settings.llm_standin_error_rate,
+        seed=settings.llm_standin_seed,
+    )
+
+
+def set_llm_provider(provider: LLMProvider | None) -> None:
+    """Swap the process-wide provider (used by load tests and local runs)."""
+    global _provider
+    _provider = provider
+
+
+@dataclass
+class LLMCallStats:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedges_skipped: int = 0
+    hedge_wins: int = 0
+    attempt_timeouts: int = 0
+    deadline_exceeded: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=500))
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> dict:
+        p50, p95, p99 = (self.percentile(q) for q in (0.5, 0.95, 0.99))
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedges_skipped": self.hedges_skipped,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges / self.attempts, 3) if self.attempts else 0.0,
+            "attempt_timeouts": self.attempt_timeouts,
+            "deadline_exceeded": self.deadline_exceeded,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "latency_p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        }
+
+
+llm_call_stats = LLMCallStats()
+
+
+def _hedge_delay() -> float | None:
+    settings = get_settings()
+    if not settings.llm_hedge_enabled:
+        return None
+    if len(llm_call_stats.latencies) < settings.llm_hedge_min_samples:
+        return settings.llm_hedge_delay_seconds
+    return llm_call_stats.percentile(0.95)
+
+
+async def _resolve_prefix(provider: LLMProvider, prompt: str, prefix: str | None) -> tuple[str, dict]:
+    """Return the text to send and extra provider arguments, using a cached prefix if one is available."""
+    if not prefix:
+        return prompt, {}
+    registry = get_prefix_registry()
+    handle = await registry.resolve(provider, prefix) if registry is not None else None
+    if handle is None:
+        return prefix + prompt, {}
+    return prompt, {"cached_prefix": handle}
+
+
+def _count_prompt_tokens(text: str) -> None:
+    # Only what is actually sent: with a cached prefix that's just the suffix
+    if metrics_registry.enabled:
+        llm_prompt_tokens.inc(estimate_tokens(text))
+
+
+def _discard_prefix(provider: LLMProvider, prefix: str | None, extra: dict) -> None:
+    """Drop a cached prefix after a failed call, e.g. one the provider already evicted."""
+    registry = get_prefix_registry()
+    if registry is not None and "cached_prefix" in extra:
+        registry.discard(provider.model_name, prefix)
+
+
+async def _attempt(
+    provider: LLMProvider, prompt: str, timeout: float, extra: dict, hedge_slots: HedgeSlots | None = None,
+) -> str:
+    """One attempt, hedged with a second identical request after the p95 delay.
+
+    With ``hedge_slots`` the hedge needs a free slot of its own, so hedging
+    never takes upstream concurrency past the cap; when none is free the
+    attempt simply waits for the primary.
+    """
+    loop = asyncio.get_running_loop()
+    started = {}
+    tasks: list[asyncio.Task] = []
+
+    def launch() -> asyncio.Task:
+        task = asyncio.create_task(provider.generate(prompt, timeout=timeout, **extra))
+        started[task] = loop.time()
+        tasks.append(task)
+        return task
+
+    primary = launch()
+    error: BaseException | None = None
+    try:
+        async with asyncio.timeout(timeout):
+            hedge_delay = _hedge_delay()
+            if hedge_delay is not None and hedge_delay < timeout:
+                await asyncio.wait({primary}, timeout=hedge_delay)
+                if not primary.done():
+                    if hedge_slots is None or await hedge_slots.try_acquire():
+                        llm_call_stats.hedges += 1
+                        hedge = launch()
+                        if hedge_slots is not None:
+                            hedge.add_done_callback(lambda _: hedge_slots.release())
+                    else:
+                        llm_call_stats.hedges_skipped += 1
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [t for t in done if t.exception() is None]
+                if winners:
+                    winner = winners[0]
+                    if winner is not primary:
+                        llm_call_stats.hedge_wins += 1
+                    llm_call_stats.latencies.append(loop.time() - started[winner])
+                    return winner.result()
+                error = next(iter(done)).exception()
+            raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+@traced("llm")
+async def generate_text(
+    prompt: str,
+    deadline: float | None = None,
+    prefix: str | None = None,
+    hedge_slots: HedgeSlots | None = None,
+) -> str:
+    """Call the provider within an overall deadline.
+
+    Failed attempts are retried with full-jitter exponential backoff while
+    time remains; each attempt is capped by the per-call timeout and can be
+    hedged (see ``_attempt``), the hedge taking its slot from ``hedge_slots``.
+    A ``prefix`` is sent through the provider's context cache when possible
+    and prepended to ``prompt`` otherwise.
+    """
+    provider = get_llm_provider()
+    if provider is None:
+        raise RuntimeError("No LLM provider configured")
+
+    settings = get_settings()
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + (deadline or settings.llm_deadline_seconds)
+    llm_call_stats.calls += 1
+    retries = 0
+
+    while True:
+        remaining = deadline_at - loop.time()
+        if remaining <= 0:
+            llm_call_stats.deadline_exceeded += 1
+            raise TimeoutError("LLM deadline exceeded")
+
+        llm_call_stats.attempts += 1
+        extra: dict = {}
+        try:
+            text, extra = await _resolve_prefix(provider, prompt, prefix)
+            _count_prompt_tokens(text)
+            return await _attempt(provider, text, min(settings.llm_timeout_seconds, remaining), extra, hedge_slots)
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                llm_call_stats.attempt_timeouts += 1
+            else:
+                _discard_prefix(provider, prefix, extra)
+            if retries >= settings.llm_max_retries:
+                # Out of retries; only a timeout that used up the overall deadline counts as exceeding it
+                if isinstance(e, TimeoutError) and loop.time() >= deadline_at:
+                    llm_call_stats.deadline_exceeded += 1
+                raise
+            retries += 1
+            llm_call_stats.retries += 1
+            backoff = random.uniform(0, settings.llm_retry_backoff_seconds * 2 ** (retries - 1))
+            if loop.time() + backoff >= deadline_at:
+                llm_call_stats.deadline_exceeded += 1
+                raise
+            logger.warning(f"LLM attempt failed ({e}), retrying in {backoff:.2f}s")
+            await asyncio.sleep(backoff)
+
+
+async def stream_text(
+    prompt: str, deadline: float | None = None, prefix: str | None = None,
+) -> AsyncIterator[str]:
+    """Yield response chunks as the provider produces them, within the deadline.
+
+    Streams are neither retried nor hedged: partial output may already have
+    been forwarded to the client.
+    """
+    provider = get_llm_provider()
+    if provider is None:
+        raise RuntimeError("No LLM provider configured")
+
+    settings = get_settings()
+    deadline = deadline or settings.llm_deadline_seconds
+    llm_call_stats.calls += 1
+    llm_call_stats.attempts += 1
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    extra: dict = {}
+    try:
+        async with asyncio.timeout(deadline):
+            text, extra = await _resolve_prefix(provider, prompt, prefix)
+            _count_prompt_tokens(text)
+            timeout = min(settings.llm_timeout_seconds, deadline)
+            async for chunk in provider.stream(text, timeout=timeout, **extra):
+                yield chunk
+    except TimeoutError:
+        llm_call_stats.deadline_exceeded += 1
+        raise
+    except Exception:
+        _discard_prefix(provider, prefix, extra)
+        raise
+    llm_call_stats.latencies.append(loop.time() - started)
+    record("llm", loop.time() - started)
+
+
+def get_llm_cache() -> CacheBackend | None:
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        if settings.llm_cache_backend == "memory":
+            _response_cache = MemoryCache(
+                settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds,
+            )
+        elif settings.llm_cache_backend == "sqlite":
+            _response_cache = SQLiteCache(
+                settings.llm_cache_path,
+                settings.llm_cache_max_entries,
+                settings.llm_cache_ttl_seconds,
+                table="llm_responses",
+            )
+    return _response_cache
+
+
+def llm_cache_key(model_name: str, template_version: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model_name, template_version, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
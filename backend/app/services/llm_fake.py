@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+
+@dataclass
+class LatencyDistribution:
+    """Log-normal body around ``median`` plus an optional slow tail."""
+    median: float = 1.0
+    sigma: float = 0.25
+    tail_probability: float = 0.0
+    tail_seconds: float = 20.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.tail_probability and rng.random() < self.tail_probability:
+            return self.tail_seconds * rng.uniform(0.8, 1.2)
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse ``"median=1.5,sigma=0.3,tail_p=0.05,tail=20"``; omitted keys keep defaults."""
+        names = {"median": "median", "sigma": "sigma", "tail_p": "tail_probability", "tail": "tail_seconds"}
+        values = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, _, value = part.partition("=")
+            values[names[key.strip()]] = float(value)
+        return cls(**values)
+
+
+class FakeLLMProvider:
+    """Local stand-in for the Gemini provider with configurable latency and errors.
+
+    It also imitates Gemini's context cache: ``create_cached_prefix`` returns
+    a handle that expires after its TTL, and calls that pass an unknown or
+    expired handle fail the way the real service does.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str], str] | None = None,
+        latency: LatencyDistribution | None = None,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        model_name: str = "fake-llm",
+        stream_chunks: int = 20,
+    ):
+        self.model_name = model_name
+        self.responder = responder or (lambda prompt: "{}")
+        self.latency = latency or LatencyDistribution()
+        self.error_rate = error_rate
+        self.stream_chunks = stream_chunks
+        self.calls = 0
+        self.prefixes_created = 0
+        self.prompt_chars_sent = 0
+        self._rng = random.Random(seed)
+        self._prefixes: dict[str, tuple[str, float]] = {}
+        self._prefix_ids = itertools.count(1)
+
+    async def create_cached_prefix(self, prefix: str, ttl: float) -> str:
+        self.prefixes_created += 1
+        self.prompt_chars_sent += len(prefix)
+        name = f"cachedContents/fake-{next(self._prefix_ids)}"
+        self._prefixes[name] = (prefix, time.monotonic() + ttl)
+        return name
+
+    async def generate(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> str:
+        self.calls += 1
+        full_prompt = self._full_prompt(prompt, cached_prefix)
+        await asyncio.sleep(self.latency.sample(self._rng))
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise RuntimeError("Injected LLM error")
+        return self.responder(full_prompt)
+
+    async def stream(
+        self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield the response in chunks spread evenly over the sampled latency."""
+        self.calls += 1
+        text = self.responder(self._full_prompt(prompt, cached_prefix))
+        chunks = max(1, min(self.stream_chunks, len(text)))
+        size = -(-len(text) // chunks)
+        delay = self.latency.sample(self._rng) / chunks
+        for start in range(0, len(text), size):
+            await asyncio.sleep(delay)
+            if self.error_rate and self._rng.random() < self.error_rate / chunks:
+                raise RuntimeError("Injected LLM error")
+            yield text[start:start + size]
+
+    def _full_prompt(self, prompt: str, cached_prefix: str | None) -> str:
+        self.prompt_chars_sent += len(prompt)
+        if cached_prefix is None:
+            return prompt
+        prefix, expires_at = self._prefixes.get(cached_prefix, ("", 0.0))
+        if expires_at <= time.monotonic():
+            self._prefixes.pop(cached_prefix, None)
+            raise RuntimeError(f"Cached content {cached_prefix} not found or expired")
+        return prefix + prompt
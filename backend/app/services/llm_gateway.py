@@ -0,0 +1,209 @@
+import asyncio
+import copy
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from app.config import get_settings
+from app.services.llm_client import (
+    get_llm_provider, get_llm_cache, llm_cache_key, llm_cache_stats,
+    generate_text, stream_text,
+)
+from app.utils.json_stream import FieldCallback, IncrementalJSONParser, replay_fields
+from app.utils.llm_helpers import parse_llm_json
+
+logger = logging.getLogger(__name__)
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waits longer than the queue deadline for an upstream slot."""
+
+
+@dataclass
+class GatewayStats:
+    upstream_calls: int = 0
+    coalesced: int = 0
+    queue_timeouts: int = 0
+    hedges: int = 0
+    waiting: int = 0
+    in_flight: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+
+    def as_dict(self) -> dict:
+        admitted = self.upstream_calls + self.queue_timeouts
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "queue_timeouts": self.queue_timeouts,
+            "hedges": self.hedges,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "queue_wait_avg_ms": round(self.queue_wait_total / admitted * 1000, 1) if admitted else 0.0,
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 1),
+        }
+
+
+class LLMGateway:
+    """Front door for every LLM call.
+
+    Identical prompts that are already in flight share one upstream call
+    (each caller receives its own copy of the result),
+    and the number of concurrent upstream requests is capped; a hedged
+    request needs a free slot of its own (see ``try_acquire``). Callers that can't
+    get a slot within the queue deadline get ``LLMQueueTimeout`` so they can
+    fall back to the no-LLM response instead of piling up.
+    """
+
+    def __init__(self, max_concurrency: int, queue_timeout: float):
+        self.queue_timeout = queue_timeout
+        self.stats = GatewayStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    async def complete_json(
+        self,
+        prompt: str,
+        template_version: str,
+        bypass_cache: bool = False,
+        prefix: str | None = None,
+    ) -> dict:
+        """Return the parsed JSON response for ``prefix + prompt``.
+
+        ``bypass_cache`` skips the cache lookup but still stores the fresh
+        result, so a retry with the flag set refreshes the cached entry. The
+        stable ``prefix`` is passed on separately so it can be served from the
+        provider's context cache.
+        """
+        provider = get_llm_provider()
+        if provider is None:
+            raise RuntimeError("No LLM provider configured")
+
+        key = llm_cache_key(provider.model_name, template_version, (prefix or "") + prompt)
+        cache = get_llm_cache()
+        if cache is not None and not bypass_cache:
+            # The cache may be SQLite on disk, so lookups and stores run off the event loop
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                llm_cache_stats.hits += 1
+                return copy.deepcopy(cached)
+            llm_cache_stats.misses += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_upstream(key, prompt, prefix))
+            task.add_done_callback(self._forget(key))
+            self._in_flight[key] = task
+        else:
+            self.stats.coalesced += 1
+
+        # Shielded so one caller going away doesn't cancel the shared call; every caller
+        # gets its own copy, since the result is also the cached value
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def stream_json(
+        self,
+        prompt: str,
+        template_version: str,
+        on_field: FieldCallback,
+        bypass_cache: bool = False,
+        prefix: str | None = None,
+    ) -> dict:
+        """Like ``complete_json`` but reports each field through ``on_field`` as it closes.
+
+        Cache hits are replayed through the same callback. Streamed calls hold
+        a concurrency slot but are not coalesced, since every caller needs its
+        own partial events.
+        """
+        provider = get_llm_provider()
+        if provider is None:
+            raise RuntimeError("No LLM provider configured")
+
+        key = llm_cache_key(provider.model_name, template_version, (prefix or "") + prompt)
+        cache = get_llm_cache()
+        if cache is not None and not bypass_cache:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                llm_cache_stats.hits += 1
+                cached = copy.deepcopy(cached)
+                replay_fields(cached, on_field)
+                return cached
+            llm_cache_stats.misses += 1
+
+        parser = IncrementalJSONParser()
+        async with self._slot():
+            async for chunk in stream_text(prompt, prefix=prefix):
+                for field, index, value in parser.feed(chunk):
+                    on_field(field, index, value)
+
+        result = parser.close()
+        if cache is not None and result:
+            await asyncio.to_thread(cache.set, key, copy.deepcopy(result))
+        return result
+
+    async def _call_upstream(self, key: str, prompt: str, prefix: str | None) -> dict:
+        async with self._slot():
+            result = parse_llm_json(await generate_text(prompt, prefix=prefix, hedge_slots=self))
+
+        cache = get_llm_cache()
+        if cache is not None and result:
+            await asyncio.to_thread(cache.set, key, result)
+        return result
+
+    @asynccontextmanager
+    async def _slot(self):
+        queued_at = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self.stats.queue_timeouts += 1
+            raise LLMQueueTimeout(f"No LLM slot within {self.queue_timeout}s")
+        finally:
+            self.stats.waiting -= 1
+
+        waited = time.perf_counter() - queued_at
+        self.stats.queue_wait_total += waited
+        self.stats.queue_wait_max = max(self.stats.queue_wait_max, waited)
+        self.stats.upstream_calls += 1
+        self.stats.in_flight += 1
+        try:
+            yield
+        finally:
+            self.stats.in_flight -= 1
+            self._semaphore.release()
+
+    async def try_acquire(self) -> bool:
+        """Take a slot for a hedge only if one is free; a saturated gateway doesn't hedge."""
+        if self._semaphore.locked():
+            return False
+        # Not locked, so this returns without waiting (and without jumping queued callers)
+        await self._semaphore.acquire()
+        self.stats.hedges += 1
+        self.stats.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.stats.in_flight -= 1
+        self._semaphore.release()
+
+    def _forget(self, key: str):
+        def callback(task: asyncio.Task) -> None:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            if not task.cancelled():
+                task.exception()  # mark retrieved when every waiter has gone
+        return callback
+
+
+_gateway: LLMGateway | None = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    global _gateway
+    if _gateway is None:
+        settings = get_settings()
+        _gateway = LLMGateway(settings.llm_max_concurrency, settings.llm_queue_timeout_seconds)
+    return _gateway
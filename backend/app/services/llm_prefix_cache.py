@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import get_settings
+from app.services.prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Stop handing out a cached prefix this long before the provider expires it
+_EXPIRY_MARGIN_SECONDS = 5.0
+# After a failed registration, send full prompts for a while before trying again
+_FAILURE_BACKOFF_SECONDS = 60.0
+
+
+@dataclass
+class PrefixCacheStats:
+    created: int = 0
+    reused: int = 0
+    expired: int = 0
+    failures: int = 0
+    skipped_small: int = 0
+    calls_with_prefix: int = 0
+    tokens_saved: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "expired": self.expired,
+            "failures": self.failures,
+            "skipped_small": self.skipped_small,
+            "calls_with_prefix": self.calls_with_prefix,
+            "tokens_saved": self.tokens_saved,
+            "tokens_saved_per_call": (
+                round(self.tokens_saved / self.calls_with_prefix, 1) if self.calls_with_prefix else 0.0
+            ),
+        }
+
+
+@dataclass
+class _Entry:
+    handle: str | None
+    expires_at: float
+    tokens: int
+    uses: int = 0
+
+
+class PrefixRegistry:
+    """Registers stable prompt prefixes (instructions plus one JD) with the provider's context cache.
+
+    The first call for a prefix creates the provider-side cache entry; later
+    calls within its TTL get the same handle and only send their own suffix.
+    Concurrent first calls share one registration. Providers without a
+    ``create_cached_prefix`` method, prefixes under the provider's minimum
+    size and failed registrations all resolve to ``None``, meaning "send the
+    full prompt".
+    """
+
+    def __init__(self, ttl_seconds: float, min_tokens: int, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.max_entries = max_entries
+        self.stats = PrefixCacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def resolve(self, provider, prefix: str) -> str | None:
+        """Return a cached-content handle for ``prefix``, registering it if needed."""
+        create = getattr(provider, "create_cached_prefix", None)
+        if create is None:
+            return None
+        self.stats.calls_with_prefix += 1
+
+        entry, registered = await self._ensure(create, provider.model_name, prefix)
+        if entry is None:
+            self.stats.skipped_small += 1
+            return None
+        if entry.handle is None:
+            return None
+        if not registered:
+            self.stats.reused += 1
+        # Registering uploaded the prefix once, so the first call on a handle saves nothing
+        if entry.uses:
+            self.stats.tokens_saved += entry.tokens
+        entry.uses += 1
+        return entry.handle
+
+    async def prepare(self, provider, prefix: str) -> None:
+        """Register ``prefix`` ahead of the call that will use it."""
+        create = getattr(provider, "create_cached_prefix", None)
+        if create is not None:
+            await self._ensure(create, provider.model_name, prefix)
+
+    async def _ensure(self, create, model_name: str, prefix: str) -> tuple[_Entry | None, bool]:
+        """Return the live entry for ``prefix`` (None if too small) and whether this call registered it."""
+        key = self._key(model_name, prefix)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.expires_at:
+                return entry, False
+            del self._entries[key]
+            if entry.handle is not None:
+                self.stats.expired += 1
+
+        tokens = estimate_tokens(prefix)
+        if tokens < self.min_tokens:
+            return None, False
+
+        task = self._pending.get(key)
+        joined = task is not None
+        if task is None:
+            task = asyncio.create_task(self._register(create, key, prefix, tokens))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task), not joined
+
+    def discard(self, model_name: str, prefix: str) -> None:
+        """Forget a handle the provider no longer recognises so the next call re-registers."""
+        self._entries.pop(self._key(model_name, prefix), None)
+
+    async def _register(self, create, key: str, prefix: str, tokens: int) -> _Entry:
+        try:
+            handle = await create(prefix, self.ttl_seconds)
+            entry = _Entry(handle, time.monotonic() + self.ttl_seconds - _EXPIRY_MARGIN_SECONDS, tokens)
+            self.stats.created += 1
+        except Exception as e:
+            logger.warning(f"Context cache registration failed, sending full prompts: {e}")
+            entry = _Entry(None, time.monotonic() + _FAILURE_BACKOFF_SECONDS, tokens)
+            self.stats.failures += 1
+
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _key(model_name: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{prefix}".encode("utf-8")).hexdigest()
+
+
+_registry: PrefixRegistry | None = None
+
+
+def get_prefix_registry() -> PrefixRegistry | None:
+    global _registry
+    settings = get_settings()
+    if not settings.llm_prefix_cache_enabled:
+        return None
+    if _registry is None:
+        _registry = PrefixRegistry(
+            settings.llm_prefix_cache_ttl_seconds, settings.llm_prefix_cache_min_tokens,
+        )
+    return _registry
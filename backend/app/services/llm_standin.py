@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+from pathlib import Path
+
+from app.services.llm_fake import FakeLLMProvider, LatencyDistribution
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_recordings(path: str) -> dict[str, str]:
+    """Read a JSONL file of ``{"prompt_hash", "response"}`` lines; later lines win."""
+    recordings: dict[str, str] = {}
+    file = Path(path)
+    if not file.exists():
+        return recordings
+    with file.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                recordings[entry["prompt_hash"]] = entry["response"]
+            except (json.JSONDecodeError, KeyError):
+                logger.warning(f"Skipping malformed recording line in {path}")
+    return recordings
+
+
+class RecordingProvider:
+    """Wraps a real provider and appends every prompt/response pair to a JSONL file.
+
+    The file can be replayed by ``StandInLLMProvider`` for deterministic
+    offline benchmarks. Prompts sent through a cached prefix are recorded
+    with the prefix text put back in front, so the hash matches what a
+    replay sees.
+    """
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.path = path
+        self._prefixes: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    async def create_cached_prefix(self, prefix: str, ttl: float) -> str:
+        handle = await self.inner.create_cached_prefix(prefix, ttl)
+        self._prefixes[handle] = prefix
+        return handle
+
+    async def generate(self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None) -> str:
+        extra = {"cached_prefix": cached_prefix} if cached_prefix else {}
+        response = await self.inner.generate(prompt, timeout=timeout, **extra)
+        await self._record(prompt, cached_prefix, response)
+        return response
+
+    async def stream(self, prompt: str, timeout: float | None = None, cached_prefix: str | None = None):
+        extra = {"cached_prefix": cached_prefix} if cached_prefix else {}
+        chunks: list[str] = []
+        async for chunk in self.inner.stream(prompt, timeout=timeout, **extra):
+            chunks.append(chunk)
+            yield chunk
+        await self._record(prompt, cached_prefix, "".join(chunks))
+
+    async def _record(self, prompt: str, cached_prefix: str | None, response: str) -> None:
+        full_prompt = self._prefixes.get(cached_prefix, "") + prompt if cached_prefix else prompt
+        line = json.dumps({
+            "prompt_hash": prompt_hash(full_prompt),
+            "model": self.model_name,
+            "response": response,
+        })
+        # File I/O off the event loop; the lock keeps concurrent lines whole
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+_SCORE_RE = re.compile(r"Current ATS score: (\d+)%")
+_SKILLS_RE = re.compile(r"SKILLS ALREADY IN RESUME \(extracted\):\n(.*)")
+_KEYWORD_SCORE_RE = re.compile(r"Keyword Match: (\d+)%")
+_MISSING_RE = re.compile(r"Missing required keywords: (.*)")
+_BULLET_LINE_RE = re.compile(r"^\s*Line (\d+): (.+)$", re.MULTILINE)
+
+
+def synthesize_response(prompt: str, rng: random.Random) -> str:
+    """Build a response with the shape the analysis or optimization prompt asks for.
+
+    Values are derived from the prompt itself (scores, extracted skills,
+    listed bullets) so downstream validation passes without fabricated
+    skills. Unknown prompts get an empty object.
+    """
+    if '"qualitative_fit"' in prompt:
+        return json.dumps(_synthesize_analysis(prompt, rng))
+    if '"optimized_summary"' in prompt or '"optimized_about"' in prompt:
+        return json.dumps(_synthesize_optimization(prompt, rng))
+    return "{}"
+
+
+def _synthesize_analysis(prompt: str, rng: random.Random) -> dict:
+    match = _KEYWORD_SCORE_RE.search(prompt)
+    keyword_score = int(match.group(1)) if match else 50
+    fits = ["weak_match", "partial_match", "good_match", "strong_match"]
+    fit = fits[min(3, keyword_score // 25)]
+    return {
+        "qualitative_fit": fit,
+        "fit_explanation": f"Synthesized analysis: the resume is a {fit.replace('_', ' ')} for this role.",
+        "strengths": [f"Strength {i + 1}" for i in range(rng.randint(3, 5))],
+        "gaps": [f"Gap {i + 1}" for i in range(rng.randint(3, 5))],
+        "bullet_rewrites": [
+            {"original": "Original bullet", "improved": "Improved bullet", "reason": "Synthesized"},
+        ],
+        "missing_keywords_to_add": [
+            {"keyword": "keyword", "where": "skills", "how": "Add it to the skills section"},
+        ],
+        "skills_section_rewrite": "Synthesized skills section",
+        "interview_readiness": rng.randint(4, 8),
+        "interview_topics": ["System design", "Past projects"],
+        "overall_recommendation": "Synthesized recommendation.",
+    }
+
+
+def _synthesize_optimization(prompt: str, rng: random.Random) -> dict:
+    match = _SCORE_RE.search(prompt)
+    current = int(match.group(1)) if match else 50
+    match = _SKILLS_RE.search(prompt)
+    skills = match.group(1).strip() if match else ""
+    match = _MISSING_RE.search(prompt)
+    missing = [k.strip() for k in match.group(1).split(",") if k.strip()] if match else []
+
+    result = {
+        "bullet_changes": [],
+        "keywords_successfully_added": [],
+        "keywords_impossible_to_add": [
+            {"keyword": k, "reason": "Synthesized: no supporting experience"} for k in missing
+        ],
+        "estimated_new_score": min(100, current + rng.randint(2, 10)),
+        "optimization_notes": "Synthesized optimization.",
+    }
+
+    if '"optimized_about"' in prompt:
+        # Rewrite the first listed bullet to itself so the LaTeX assembler still runs
+        bullet = _BULLET_LINE_RE.search(prompt)
+        result["optimized_about"] = ""
+        result["optimized_skills_block"] = ""
+        if bullet:
+            result["bullet_changes"].append({
+                "section": "experience",
+                "entry_index": 0,
+                "bullet_index": 0,
+                "original_latex": bullet.group(2),
+                "optimized_latex": bullet.group(2),
+                "keywords_added": [],
+                "reason": "Synthesized",
+            })
+    else:
+        result["optimized_summary"] = "Synthesized summary aligned with the job description."
+        result["optimized_skills"] = skills
+    return result
+
+
+class StandInLLMProvider(FakeLLMProvider):
+    """Offline provider for benchmarks and load tests.
+
+    Prompts that were recorded from a real provider replay the recorded
+    response; any other prompt gets a synthesized, schema-valid response.
+    Latency, errors and the context cache behave as in ``FakeLLMProvider``.
+    """
+
+    def __init__(
+        self,
+        recordings: dict[str, str] | None = None,
+        latency: LatencyDistribution | None = None,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        super().__init__(
+            responder=self._respond,
+            latency=latency,
+            error_rate=error_rate,
+            seed=seed,
+            model_name="standin",
+        )
+        self.recordings = recordings or {}
+        self.replayed = 0
+        self.synthesized = 0
+
+    def _respond(self, prompt: str) -> str:
+        recorded = self.recordings.get(prompt_hash(prompt))
+        if recorded is not None:
+            self.replayed += 1
+            return recorded
+        self.synthesized += 1
+        return synthesize_response(prompt, self._rng)
@@ -2,6 +2,7 @@ import re
 from app.models.schemas import ValidationResult, LatexValidation
 from app.utils.implication_map import get_implied_skills
 from app.services.latex_parser import validate_latex_syntax
+from app.utils.timing import traced
 
 
 def extract_skills_from_text(text: str) -> set[str]:
@@ -15,6 +16,7 @@ def extract_numbers(text: str) -> list[str]:
     return re.findall(r"\b\d+(?:\.\d+)?%?\b", text)
 
 
+@traced("validate")
 def validate_optimization(
     original_text: str,
     optimized_text: str,
@@ -36,6 +38,9 @@ def validate_optimization(
     return ValidationResult(valid=True, message="Validation passed")
 
 
+@traced("validate")
 def validate_latex_output(tex_content: str) -> LatexValidation:
     result = validate_latex_syntax(tex_content)
-    return LatexValidation(valid=result["valid"], errors=result["errors"])
+    return LatexValidation(
+        valid=result["valid"], errors=result["errors"], line=result["line"], column=result["column"],
+    )
@@ -0,0 +1,355 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[dict]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+# Idle workers re-check the table this often; new jobs from this process wake them immediately
+_POLL_SECONDS = 1.0
+# A running job not touched for this long belongs to a process that died; several server
+# processes can share the file, so one starting up can't assume every running job is orphaned
+_STALE_RUNNING_SECONDS = 300.0
+# Workers touch their running job this often, so long jobs are never mistaken for stale ones
+_HEARTBEAT_SECONDS = _STALE_RUNNING_SECONDS / 3
+
+
+class JobStore:
+    """Durable optimization job queue in a local SQLite file (WAL mode).
+
+    Jobs survive a restart: a job left marked running by a process that
+    died goes back to the queue once it is stale (workers touch their
+    running job periodically), or fails if it is out of attempts.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS optimize_jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, "
+            "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, available_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL, finished_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS optimize_jobs_queue ON optimize_jobs (status, available_at)"
+        )
+        self._conn.commit()
+
+    def enqueue(self, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO optimize_jobs (id, status, params, created_at, available_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), now, now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def claim(self) -> tuple[str, dict, int] | None:
+        """Mark the oldest runnable job as running and return (id, params, attempt number).
+
+        Selecting and marking happen in one UPDATE statement (RETURNING needs
+        SQLite 3.35+), so two server processes sharing the file can't claim
+        the same job.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE optimize_jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = (SELECT id FROM optimize_jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY created_at LIMIT 1) AND status = ? "
+                "RETURNING id, params, attempts",
+                (RUNNING, now, QUEUED, now, QUEUED),
+            ).fetchone()
+            self._conn.commit()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def succeed(self, job_id: str, result: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE optimize_jobs SET status = ?, result = ?, error = NULL, "
+                "updated_at = ?, finished_at = ? WHERE id = ?",
+                (SUCCEEDED, json.dumps(result), now, now, job_id),
+            )
+            self._conn.commit()
+
+    def fail(self, job_id: str, error: str, retry_at: float | None = None) -> None:
+        """Record a failed attempt; with ``retry_at`` the job is queued again from then."""
+        now = time.time()
+        with self._lock:
+            if retry_at is None:
+                self._conn.execute(
+                    "UPDATE optimize_jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                    (FAILED, error, now, now, job_id),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE optimize_jobs SET status = ?, error = ?, available_at = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, error, retry_at, now, job_id),
+                )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, result, error, attempts, created_at, updated_at, finished_at "
+                "FROM optimize_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "result": json.loads(row[2]) if row[2] else None,
+            "error": row[3],
+            "attempts": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+            "finished_at": row[7],
+        }
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM optimize_jobs GROUP BY status",
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def touch(self, job_id: str) -> None:
+        """Record that a running job is still being worked on, so it doesn't go stale."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE optimize_jobs SET updated_at = ? WHERE id = ? AND status = ?",
+                (time.time(), job_id, RUNNING),
+            )
+            self._conn.commit()
+
+    def requeue_stale(self, older_than: float, max_attempts: int) -> tuple[int, int]:
+        """Put running jobs last touched before ``older_than`` back in the queue.
+
+        A stale job that has already used ``max_attempts`` attempts is marked
+        failed instead. Returns (re-queued, failed).
+        """
+        now = time.time()
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE optimize_jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? "
+                "WHERE status = ? AND updated_at < ? AND attempts >= ?",
+                (FAILED, "interrupted: the worker running this job stopped", now, now, RUNNING, older_than, max_attempts),
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE optimize_jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (QUEUED, now, RUNNING, older_than),
+            ).rowcount
+            self._conn.commit()
+        return requeued, failed
+
+    def release(self, job_ids: list[str]) -> int:
+        """Put running jobs back in the queue without counting the interrupted attempt."""
+        if not job_ids:
+            return 0
+        now = time.time()
+        placeholders = ",".join("?" * len(job_ids))
+        with self._lock:
+            released = self._conn.execute(
+                "UPDATE optimize_jobs SET status = ?, attempts = MAX(attempts - 1, 0), "
+                f"available_at = ?, updated_at = ? WHERE status = ? AND id IN ({placeholders})",
+                (QUEUED, now, now, RUNNING, *job_ids),
+            ).rowcount
+            self._conn.commit()
+        return released
+
+    def expire(self, older_than: float) -> int:
+        """Delete finished jobs whose result has been kept since before ``older_than``."""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM optimize_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (older_than,),
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+
+class JobQueue:
+    """Bounded pool of asyncio workers draining a ``JobStore``.
+
+    Each worker runs one job at a time through ``handler``; a failed
+    attempt is retried with exponential backoff until
+    ``optimize_job_max_attempts``. Finished jobs are deleted after
+    ``optimize_job_ttl_seconds``.
+    """
+
+    def __init__(self, store: JobStore, handler: JobHandler, workers: int, max_attempts: int, ttl_seconds: float):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.ttl_seconds = ttl_seconds
+        self._tasks: list[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._changed: dict[str, asyncio.Event] = {}
+        self._waiters: dict[str, int] = {}
+        # Jobs this process has claimed and not yet finished, handed back on stop
+        self._held: set[str] = set()
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire()))
+        logger.info(f"Optimization job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        # Interrupted jobs go straight back to the queue, and the restart doesn't use up
+        # one of their attempts; only a process that dies leaves them to go stale
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = await asyncio.to_thread(self.store.release, sorted(self._held))
+        if released:
+            logger.info(f"Re-queued {released} optimization jobs interrupted by shutdown")
+        self._held.clear()
+
+    async def submit(self, params: dict) -> str:
+        job_id = await asyncio.to_thread(self.store.enqueue, params)
+        self._wake.set()
+        return job_id
+
+    async def wait_for_change(self, job_id: str, timeout: float) -> None:
+        """Return when the job changes state in this process, or after ``timeout``."""
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # The job may finish in another process or the client may leave, so the
+            # last waiter drops the event rather than leaving it for _notify
+            remaining = self._waiters.pop(job_id) - 1
+            if remaining:
+                self._waiters[job_id] = remaining
+            else:
+                self._changed.pop(job_id, None)
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _work(self) -> None:
+        while True:
+            claiming = asyncio.ensure_future(asyncio.to_thread(self.store.claim))
+            try:
+                claimed = await asyncio.shield(claiming)
+            except asyncio.CancelledError:
+                # The claim finishes in its thread anyway; keep the job so stop can release it
+                claimed = await claiming
+                if claimed is not None:
+                    self._held.add(claimed[0])
+                raise
+            if claimed is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), _POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, params, attempt = claimed
+            self._held.add(job_id)
+            self._notify(job_id)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                result = await self.handler(params)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                retry_at = None
+                if attempt < self.max_attempts:
+                    retry_at = time.time() + 2 ** (attempt - 1)
+                    logger.warning(f"Optimization job {job_id} attempt {attempt} failed, retrying: {e}")
+                else:
+                    logger.error(f"Optimization job {job_id} failed after {attempt} attempts: {e}")
+                await asyncio.to_thread(self.store.fail, job_id, str(e), retry_at)
+            else:
+                await asyncio.to_thread(self.store.succeed, job_id, result)
+            finally:
+                heartbeat.cancel()
+            self._held.discard(job_id)
+            self._notify(job_id)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(_HEARTBEAT_SECONDS)
+            try:
+                await asyncio.to_thread(self.store.touch, job_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not refresh optimization job {job_id}: {e}")
+
+    async def _expire(self) -> None:
+        while True:
+            now = time.time()
+            requeued, failed = await asyncio.to_thread(
+                self.store.requeue_stale, now - _STALE_RUNNING_SECONDS, self.max_attempts,
+            )
+            if requeued:
+                logger.warning(f"Re-queued {requeued} interrupted optimization jobs")
+                self._wake.set()
+            if failed:
+                logger.error(f"Failed {failed} interrupted optimization jobs that were out of attempts")
+            deleted = await asyncio.to_thread(self.store.expire, now - self.ttl_seconds)
+            if deleted:
+                logger.info(f"Expired {deleted} finished optimization jobs")
+            await asyncio.sleep(min(60.0, max(1.0, self.ttl_seconds / 10)))
+
+
+_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue | None:
+    return _queue
+
+
+async def start_job_queue(handler: JobHandler) -> None:
+    global _queue
+    settings = get_settings()
+    if settings.optimize_job_workers <= 0 or _queue is not None:
+        return
+    _queue = JobQueue(
+        JobStore(settings.optimize_job_db_path),
+        handler,
+        workers=settings.optimize_job_workers,
+        max_attempts=settings.optimize_job_max_attempts,
+        ttl_seconds=settings.optimize_job_ttl_seconds,
+    )
+    _queue.start()
+
+
+async def stop_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
@@ -0,0 +1,123 @@
+import re
+from app.models.schemas import KeywordMatchResult
+from app.config import get_settings
+from app.services.jd_parser import extract_jd_sections, extract_title
+from app.services.resume_parser import detect_sections
+from app.utils.text_processing import clean_text
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# JD sections worth sending, most important first. "benefits" and "description"
+# are left out: they cost input tokens without telling the LLM anything about fit
+_JD_SECTION_ORDER = ["required", "qualifications", "responsibilities", "preferred"]
+
+# Static weight of a resume section before keyword hits are added
+_RESUME_SECTION_PRIORITY = {
+    "experience": 3.0, "work experience": 3.0, "professional experience": 3.0, "employment": 3.0,
+    "skills": 3.0, "technical skills": 3.0, "core competencies": 3.0, "technologies": 3.0,
+    "summary": 3.0, "about": 3.0, "profile": 3.0, "objective": 1.5,
+    "projects": 2.0, "personal projects": 2.0, "academic projects": 2.0,
+    "education": 1.0, "academic": 1.0, "academics": 1.0,
+    "certifications": 1.0, "certificates": 1.0, "licenses": 1.0,
+}
+_DEFAULT_SECTION_PRIORITY = 0.5
+
+# Don't bother truncating a section into a sliver smaller than this
+_MIN_SECTION_TOKENS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """Local estimate of the LLM token count: roughly one token per four characters of a word."""
+    return sum((len(t) + 3) // 4 for t in _TOKEN_RE.findall(text))
+
+
+def fit_to_budget(text: str, budget: int) -> str:
+    """Keep whole lines of ``text`` while they fit in ``budget`` tokens."""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept: list[str] = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def compact_jd(jd_text: str, budget: int | None = None) -> str:
+    """Keep the JD sections that drive matching, in priority order, within ``budget`` tokens.
+
+    Benefits, perks and the generic description (where EEO text and company
+    blurbs end up) are dropped. A JD without recognisable headings is kept as
+    is, cut to the budget.
+    """
+    if budget is None:
+        budget = get_settings().llm_prompt_jd_tokens
+
+    text = clean_text(jd_text)
+    sections = extract_jd_sections(text)
+    kept = [name for name in _JD_SECTION_ORDER if sections.get(name)]
+    if not kept:
+        return fit_to_budget(text, budget)
+
+    title = extract_title(text)
+    blocks = [title] if title else []
+    blocks += [f"{name.upper()}:\n{sections[name]}" for name in kept]
+    return _pack(blocks, list(range(len(blocks))), budget)
+
+
+def compact_resume(
+    resume_text: str,
+    sections: dict[str, str] | None = None,
+    keyword_results: list[KeywordMatchResult] | None = None,
+    budget: int | None = None,
+) -> str:
+    """Fit the resume into ``budget`` tokens, filling it with the most relevant sections first.
+
+    A section's relevance is its static priority (experience and skills
+    first) plus the share of matched JD keywords found in it. Sections keep
+    their original order in the output; the ones that don't fit are cut at a
+    line boundary or left out.
+    """
+    if budget is None:
+        budget = get_settings().llm_prompt_resume_tokens
+    if estimate_tokens(resume_text) <= budget:
+        return resume_text
+
+    if sections is None:
+        sections = detect_sections(resume_text)
+    if not sections:
+        return fit_to_budget(resume_text, budget)
+
+    hits: dict[str, int] = {}
+    for r in keyword_results or []:
+        if r.found and r.location_in_resume:
+            hits[r.location_in_resume] = hits.get(r.location_in_resume, 0) + 1
+    total_hits = sum(hits.values()) or 1
+
+    names = list(sections)
+    blocks = [f"{name.upper()}\n{sections[name]}" for name in names]
+    relevance = [
+        _RESUME_SECTION_PRIORITY.get(name, _DEFAULT_SECTION_PRIORITY) + hits.get(name, 0) / total_hits
+        for name in names
+    ]
+    order = sorted(range(len(names)), key=lambda i: relevance[i], reverse=True)
+    return _pack(blocks, order, budget)
+
+
+def _pack(blocks: list[str], order: list[int], budget: int) -> str:
+    """Fill ``budget`` with ``blocks`` taken in ``order``, then join them in their original order."""
+    chosen: dict[int, str] = {}
+    remaining = budget
+    for i in order:
+        cost = estimate_tokens(blocks[i]) + 2
+        if cost <= remaining:
+            chosen[i] = blocks[i]
+            remaining -= cost
+        elif remaining >= _MIN_SECTION_TOKENS:
+            chosen[i] = fit_to_budget(blocks[i], remaining - 2)
+            remaining = 0
+    return "\n\n".join(chosen[i] for i in sorted(chosen))
@@ -2,19 +2,25 @@ import logging
 from app.models.schemas import (
     OptimizeResponse, ResumeChange, BulletChange,
     KeywordImpossible, LatexBulletChange, ValidationResult,
-    ParsedResume, ParsedJD, ATSAnalysisResponse,
+    ParsedResume, ParsedJD, ATSAnalysisResponse, KeywordMatchResult,
 )
-from app.services.latex_parser import parse_latex_resume, LatexResumeMap
+from app.services.latex_parser import get_latex_map, LatexResumeMap
 from app.services.latex_assembler import assemble_optimized_latex
 from app.services.optimization_validator import (
     validate_optimization, validate_latex_output,
 )
 from app.services.resume_parser import is_latex, latex_to_plain
-from app.config import get_settings
-from app.utils.llm_helpers import parse_llm_json
+from app.services.llm_client import get_llm_provider
+from app.services.llm_gateway import get_llm_gateway, LLMQueueTimeout
+from app.services.prompt_builder import compact_jd, compact_resume
+from app.utils.json_stream import FieldCallback
+from app.utils.timing import traced
 
 logger = logging.getLogger(__name__)
 
+# Bump when either optimization prompt changes so cached responses are not reused
+OPTIMIZE_PROMPT_VERSION = "1"
+
 OPTIMIZE_PROMPT_PLAIN = """You are an expert resume optimizer. Your job is to rewrite resume content to maximize ATS keyword matching against a specific job description, while keeping everything 100% truthful.
 
 ORIGINAL RESUME:
@@ -147,10 +153,14 @@ async def optimize_resume(
     jd_text: str,
     analysis: ATSAnalysisResponse,
     raw_latex: str | None = None,
+    latex_map: LatexResumeMap | None = None,
+    bypass_cache: bool = False,
+    on_field: FieldCallback | None = None,
 ) -> OptimizeResponse:
-    settings = get_settings()
     is_latex_input = raw_latex is not None and is_latex(raw_latex)
     input_format = "latex" if is_latex_input else "plain"
+    if is_latex_input and latex_map is None:
+        latex_map = get_latex_map(raw_latex)
 
     # Get missing keywords
     missing_required = [
@@ -176,10 +186,29 @@ async def optimize_resume(
         existing_skills=existing_skills,
         current_score=analysis.overall_score,
         weak_sections=weak_sections,
-        is_latex=is_latex_input,
-        raw_latex=raw_latex,
+        sections=analysis.parsed_resume.sections,
+        keyword_results=analysis.keyword_results,
+        latex_map=latex_map if is_latex_input else None,
+        bypass_cache=bypass_cache,
+        on_field=on_field,
+    )
+    return _apply_optimization(
+        llm_result, resume_text, raw_latex, input_format, is_latex_input, latex_map, analysis, existing_skills,
     )
 
+
+@traced("optimize")
+def _apply_optimization(
+    llm_result: dict | None,
+    resume_text: str,
+    raw_latex: str | None,
+    input_format: str,
+    is_latex_input: bool,
+    latex_map: LatexResumeMap | None,
+    analysis: ATSAnalysisResponse,
+    existing_skills: list[str],
+) -> OptimizeResponse:
+    """Turn the LLM's rewrite into the response; timed as ``optimize``, without the LLM call."""
     if not llm_result:
         return OptimizeResponse(
             input_format=input_format,
@@ -201,9 +230,10 @@ async def optimize_resume(
 
     optimized_summary = llm_result.get("optimized_summary", "") or llm_result.get("optimized_about", "")
     optimized_skills = llm_result.get("optimized_skills", "") or llm_result.get("optimized_skills_block", "")
+    plain_summary = latex_to_plain(optimized_summary) if is_latex_input else optimized_summary
+    plain_skills = latex_to_plain(optimized_skills) if is_latex_input else optimized_skills
 
-    if is_latex_input and raw_latex:
-        latex_map = parse_latex_resume(raw_latex)
+    if is_latex_input and latex_map:
         optimized_bullets_map: dict[int, str] = {}
         latex_bullet_changes = []
 
@@ -270,7 +300,7 @@ async def optimize_resume(
             section="summary",
             change_type="rewrite",
             original="",
-            optimized=optimized_summary if not is_latex_input else latex_to_plain(optimized_summary),
+            optimized=plain_summary,
             original_latex=None,
             optimized_latex=optimized_summary if is_latex_input else None,
             keywords_added=[],
@@ -282,7 +312,7 @@ async def optimize_resume(
             section="skills",
             change_type="rewrite",
             original="",
-            optimized=optimized_skills if not is_latex_input else latex_to_plain(optimized_skills),
+            optimized=plain_skills,
             original_latex=None,
             optimized_latex=optimized_skills if is_latex_input else None,
             keywords_added=[],
@@ -315,8 +345,8 @@ async def optimize_resume(
         fabricated_skills_removed=validation.fabricated_skills,
         keywords_added=keywords_added,
         keywords_impossible=keywords_impossible,
-        optimized_summary=optimized_summary if not is_latex_input else latex_to_plain(optimized_summary),
-        optimized_skills=optimized_skills if not is_latex_input else latex_to_plain(optimized_skills),
+        optimized_summary=plain_summary,
+        optimized_skills=plain_skills,
         optimized_bullets=bullet_changes,
         optimized_about_latex=optimized_summary if is_latex_input else None,
         optimized_skills_latex=optimized_skills if is_latex_input else None,
@@ -361,22 +391,18 @@ async def _call_optimization_llm(
     existing_skills: list[str],
     current_score: int,
     weak_sections: list[str],
-    is_latex: bool = False,
-    raw_latex: str | None = None,
+    sections: dict[str, str] | None = None,
+    keyword_results: list[KeywordMatchResult] | None = None,
+    latex_map: LatexResumeMap | None = None,
+    bypass_cache: bool = False,
+    on_field: FieldCallback | None = None,
 ) -> dict | None:
-    settings = get_settings()
-    if not settings.gemini_api_key:
+    if get_llm_provider() is None:
         logger.warning("No Gemini API key, skipping optimization")
         return None
 
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
-
-        if is_latex and raw_latex:
-            latex_map = parse_latex_resume(raw_latex)
-
+        if latex_map is not None:
             exp_bullets = ""
             if latex_map.experience_entries:
                 for entry in latex_map.experience_entries:
@@ -390,7 +416,7 @@ async def _call_optimization_llm(
                         proj_bullets += f"  Line {bullet.line_number}: {bullet.latex_text}\n"
 
             prompt = OPTIMIZE_PROMPT_LATEX.format(
-                jd_text=jd_text[:3000],
+                jd_text=compact_jd(jd_text),
                 missing_required=", ".join(missing_required),
                 missing_preferred=", ".join(missing_preferred),
                 existing_skills=", ".join(existing_skills),
@@ -402,8 +428,8 @@ async def _call_optimization_llm(
             )
         else:
             prompt = OPTIMIZE_PROMPT_PLAIN.format(
-                resume_text=resume_text[:4000],
-                jd_text=jd_text[:3000],
+                resume_text=compact_resume(resume_text, sections, keyword_results),
+                jd_text=compact_jd(jd_text),
                 missing_required=", ".join(missing_required),
                 missing_preferred=", ".join(missing_preferred),
                 weak_sections=", ".join(weak_sections),
@@ -411,9 +437,18 @@ async def _call_optimization_llm(
                 existing_skills=", ".join(existing_skills),
             )
 
-        response = model.generate_content(prompt)
-        return parse_llm_json(response.text)
+        gateway = get_llm_gateway()
+        if on_field is None:
+            return await gateway.complete_json(
+                prompt, OPTIMIZE_PROMPT_VERSION, bypass_cache=bypass_cache,
+            )
+        return await gateway.stream_json(
+            prompt, OPTIMIZE_PROMPT_VERSION, on_field, bypass_cache=bypass_cache,
+        )
 
+    except LLMQueueTimeout as e:
+        logger.warning(f"{e}, skipping optimization")
+        return None
     except Exception as e:
         logger.error(f"Optimization LLM call failed: {e}")
         return None
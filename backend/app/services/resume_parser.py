@@ -8,6 +8,8 @@ from app.utils.text_processing import (
     extract_urls, count_words, estimate_pages,
 )
 from app.utils.constants import SECTION_HEADERS
+from app.services.latex_parser import get_latex_map
+from app.utils.timing import traced
 
 
 def is_latex(text: str) -> bool:
@@ -236,13 +238,17 @@ def extract_education(sections: dict[str, str]) -> list[EducationEntry]:
     return education
 
 
+@traced("resume_parse")
 def parse_resume(text: str) -> ParsedResume:
     raw_latex = None
+    latex_sections = None
     input_format = "txt"
     if is_latex(text):
         raw_latex = text
         input_format = "latex"
-        text = latex_to_plain(text)
+        latex_map = get_latex_map(text)
+        latex_sections = latex_map.latex_sections
+        text = latex_map.plain_text
 
     text = clean_text(text)
     sections = detect_sections(text)
@@ -285,7 +291,7 @@ def parse_resume(text: str) -> ParsedResume:
         input_format=input_format,
         contact=contact,
         sections=sections,
-        latex_sections=None,
+        latex_sections=latex_sections,
         skills=skills,
         experience=experience,
         education=education,
@@ -1,5 +1,7 @@
 from app.models.schemas import ATSAnalysisResponse, Suggestion
 
+OVERALL_WEIGHTS = {"keyword": 0.40, "semantic": 0.35, "structure": 0.25}
+
 
 def get_recruiter_status(score: int) -> str:
     if score >= 80:
@@ -29,8 +31,8 @@ def compute_overall_score(
     structure_score: int,
 ) -> int:
     weighted = (
-        keyword_score * 0.40
-        + semantic_score * 0.35
-        + structure_score * 0.25
+        keyword_score * OVERALL_WEIGHTS["keyword"]
+        + semantic_score * OVERALL_WEIGHTS["semantic"]
+        + structure_score * OVERALL_WEIGHTS["structure"]
     )
     return int(round(weighted))
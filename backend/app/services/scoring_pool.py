@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config import get_settings
+from app.models.schemas import (
+    KeywordMatchResult, ParsedJD, ParsedResume, SemanticResult, StructureResult,
+)
+from app.services.analysis_pipeline import ScoredResume, compact_summary, score_batch, score_resume
+from app.utils import timing
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+
+# Per-worker parsed (and, once a batch needs them, encoded) JDs, so many resumes
+# scored against one posting run KeyBERT and the JD encode once per worker
+_JD_CACHE_SIZE = 32
+_jd_cache: OrderedDict[str, tuple[ParsedJD, object]] = OrderedDict()
+_jd_cache_lock = threading.Lock()  # thread mode shares the cache between chunks
+
+
+def _init_worker() -> None:
+    """Load the models once per worker process instead of on its first request."""
+    from app.services.jd_parser import _get_keybert
+    from app.services.semantic_scorer import _get_model
+
+    _get_keybert()
+    _get_model()
+
+
+def _cached_jd(jd_text: str, encoded: bool = False) -> tuple[ParsedJD, object]:
+    from app.services.jd_parser import parse_jd
+    from app.services.semantic_scorer import encode_jd
+
+    key = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    with _jd_cache_lock:
+        entry = _jd_cache.get(key)
+    if entry is None:
+        entry = (parse_jd(jd_text), None)
+    if encoded and entry[1] is None:
+        entry = (entry[0], encode_jd(entry[0]))
+
+    with _jd_cache_lock:
+        _jd_cache[key] = entry
+        _jd_cache.move_to_end(key)
+        while len(_jd_cache) > _JD_CACHE_SIZE:
+            _jd_cache.popitem(last=False)
+    return entry
+
+
+def _score_in_worker(resume_text: str, jd_text: str) -> tuple[tuple, list[timing.Span]]:
+    # Plain dicts and ints pickle smaller and faster than the pydantic models.
+    # The stage spans go back with the result so the parent can report them.
+    with timing.collecting() as spans:
+        parsed_jd, jd_embeddings = _cached_jd(jd_text)
+        scored = score_resume(resume_text, jd_text, parsed_jd=parsed_jd, jd_embeddings=jd_embeddings)
+    compact = (
+        scored.parsed_resume.model_dump(),
+        scored.parsed_jd.model_dump(),
+        scored.keyword_score,
+        [r.model_dump() for r in scored.keyword_results],
+        scored.semantic_score,
+        scored.semantic_results.model_dump(),
+        scored.structure_score,
+        scored.structure_results.model_dump(),
+        scored.overall_score,
+    )
+    return compact, spans
+
+
+def _summarize_batch(resume_texts: list[str], jd_text: str) -> list[dict]:
+    parsed_jd, jd_embeddings = _cached_jd(jd_text, encoded=True)
+    return [
+        {"error": str(scored)} if isinstance(scored, Exception) else compact_summary(scored)
+        for scored in score_batch(resume_texts, parsed_jd, jd_embeddings)
+    ]
+
+
+def _score_batch_in_worker(resume_texts: list[str], jd_text: str) -> tuple[list[dict], list[timing.Span]]:
+    with timing.collecting() as spans:
+        summaries = _summarize_batch(resume_texts, jd_text)
+    return summaries, spans
+
+
+def _from_compact(compact: tuple) -> ScoredResume:
+    (resume, jd, keyword_score, keyword_results, semantic_score,
+     semantic_results, structure_score, structure_results, overall_score) = compact
+    return ScoredResume(
+        parsed_resume=ParsedResume.model_validate(resume),
+        parsed_jd=ParsedJD.model_validate(jd),
+        keyword_score=keyword_score,
+        keyword_results=[KeywordMatchResult.model_validate(r) for r in keyword_results],
+        semantic_score=semantic_score,
+        semantic_results=SemanticResult.model_validate(semantic_results),
+        structure_score=structure_score,
+        structure_results=StructureResult.model_validate(structure_results),
+        overall_score=overall_score,
+    )
+
+
+def get_scoring_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    workers = get_settings().scoring_workers
+    if _pool is None and workers > 0:
+        # spawn rather than fork: the parent already runs the event loop and
+        # model libraries that start their own threads
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    return _pool
+
+
+async def start_scoring_pool() -> None:
+    """Start every worker and wait for its models to load, so no request pays for it."""
+    pool = get_scoring_pool()
+    if pool is None:
+        return
+    loop = asyncio.get_running_loop()
+    workers = get_settings().scoring_workers
+    await asyncio.gather(*[loop.run_in_executor(pool, _init_worker) for _ in range(workers)])
+    logger.info(f"Scoring pool ready with {workers} worker processes")
+
+
+def shutdown_scoring_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def run_scoring(resume_text: str, jd_text: str) -> ScoredResume:
+    """Run the deterministic layers off the event loop.
+
+    Uses the process pool when ``scoring_workers`` is set, otherwise a
+    thread. A broken pool (a worker died) is replaced and the request falls
+    back to a thread.
+    """
+    pool = get_scoring_pool()
+    if pool is None:
+        return await asyncio.to_thread(score_resume, resume_text, jd_text)
+
+    loop = asyncio.get_running_loop()
+    try:
+        compact, spans = await loop.run_in_executor(pool, _score_in_worker, resume_text, jd_text)
+    except BrokenProcessPool:
+        logger.error("Scoring pool broke, restarting it and scoring this request in a thread")
+        if _pool is pool:
+            shutdown_scoring_pool()
+        return await asyncio.to_thread(score_resume, resume_text, jd_text)
+    timing.record_all(spans)
+    return _from_compact(compact)
+
+
+async def prepare_batch_jd(jd_text: str) -> None:
+    """Parse and encode the JD once before a batch's chunks start in threads.
+
+    Pool workers do this on their first chunk and keep the result.
+    """
+    if get_scoring_pool() is None:
+        await asyncio.to_thread(_cached_jd, jd_text, True)
+
+
+async def run_batch_scoring(resume_texts: list[str], jd_text: str) -> list[dict]:
+    """Score a chunk of resumes against one JD and return their compact summaries.
+
+    Only the texts cross into a pool worker; the JD is parsed and encoded
+    once per worker (or once per process in thread mode) and cached.
+    """
+    pool = get_scoring_pool()
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            summaries, spans = await loop.run_in_executor(pool, _score_batch_in_worker, resume_texts, jd_text)
+        except BrokenProcessPool:
+            logger.error("Scoring pool broke, restarting it and scoring this chunk in a thread")
+            if _pool is pool:
+                shutdown_scoring_pool()
+        else:
+            timing.record_all(spans)
+            return summaries
+    return await asyncio.to_thread(_summarize_batch, resume_texts, jd_text)
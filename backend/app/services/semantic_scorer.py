@@ -1,6 +1,11 @@
 import numpy as np
 from app.models.schemas import SemanticResult, ParsedResume, ParsedJD
 from app.config import get_settings
+from app.utils.metrics import encoded_texts
+from app.utils.timing import traced
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+SECTION_WEIGHTS = {"skills": 0.40, "experience": 0.35, "education": 0.15, "overall": 0.10}
 
 _model = None
 
@@ -12,7 +17,7 @@ def _get_model():
             from sentence_transformers import SentenceTransformer
             settings = get_settings()
             _model = SentenceTransformer(
-                "all-MiniLM-L6-v2",
+                MODEL_NAME,
                 cache_folder=settings.model_cache_dir,
             )
         except Exception:
@@ -26,14 +31,7 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
 
-def compute_semantic_score(
-    parsed_resume: ParsedResume,
-    parsed_jd: ParsedJD,
-) -> tuple[int, SemanticResult]:
-    model = _get_model()
-    if model is None:
-        return 0, SemanticResult()
-
+def _resume_texts(parsed_resume: ParsedResume) -> list[str]:
     resume_skills = parsed_resume.sections.get("skills", "") or parsed_resume.sections.get("technical skills", "")
     resume_experience = ""
     for key in ["experience", "work experience", "professional experience"]:
@@ -41,37 +39,49 @@ def compute_semantic_score(
             resume_experience = parsed_resume.sections[key]
             break
     resume_education = parsed_resume.sections.get("education", "")
-    resume_full = parsed_resume.raw_text
+    return [
+        resume_skills or "no skills listed",
+        resume_experience or "no experience listed",
+        resume_education or "no education listed",
+        parsed_resume.raw_text,
+    ]
 
+
+def _jd_texts(parsed_jd: ParsedJD) -> list[str]:
     jd_full = parsed_jd.raw_text
     jd_required = " ".join(parsed_jd.required_skills)
     jd_responsibilities = " ".join(parsed_jd.responsibilities) if parsed_jd.responsibilities else jd_full
     jd_qualifications = " ".join(parsed_jd.qualifications) if parsed_jd.qualifications else ""
-
-    texts_to_encode = [
-        resume_skills or "no skills listed",
-        resume_experience or "no experience listed",
-        resume_education or "no education listed",
-        resume_full,
+    return [
         jd_required or jd_full,
         jd_responsibilities,
         jd_qualifications or jd_full,
         jd_full,
     ]
 
-    embeddings = model.encode(texts_to_encode, show_progress_bar=False)
 
-    skills_sim = cosine_similarity(embeddings[0], embeddings[4])
-    experience_sim = cosine_similarity(embeddings[1], embeddings[5])
-    education_sim = cosine_similarity(embeddings[2], embeddings[6])
-    overall_sim = cosine_similarity(embeddings[3], embeddings[7])
+def encode_jd(parsed_jd: ParsedJD) -> np.ndarray | None:
+    """Encode the JD side once so it can be reused for every resume scored against it."""
+    model = _get_model()
+    if model is None:
+        return None
+    texts = _jd_texts(parsed_jd)
+    encoded_texts.inc(len(texts))
+    return model.encode(texts, show_progress_bar=False)
+
+
+def _score_embeddings(resume_embeddings: np.ndarray, jd_embeddings: np.ndarray) -> tuple[int, SemanticResult]:
+    skills_sim = cosine_similarity(resume_embeddings[0], jd_embeddings[0])
+    experience_sim = cosine_similarity(resume_embeddings[1], jd_embeddings[1])
+    education_sim = cosine_similarity(resume_embeddings[2], jd_embeddings[2])
+    overall_sim = cosine_similarity(resume_embeddings[3], jd_embeddings[3])
 
     # Weighted average
     weighted = (
-        skills_sim * 0.40
-        + experience_sim * 0.35
-        + education_sim * 0.15
-        + overall_sim * 0.10
+        skills_sim * SECTION_WEIGHTS["skills"]
+        + experience_sim * SECTION_WEIGHTS["experience"]
+        + education_sim * SECTION_WEIGHTS["education"]
+        + overall_sim * SECTION_WEIGHTS["overall"]
     )
 
     section_similarities = {
@@ -91,3 +101,50 @@ def compute_semantic_score(
 
     score = int(round(weighted * 100))
     return min(100, max(0, score)), result
+
+
+@traced("semantic")
+def compute_semantic_score(
+    parsed_resume: ParsedResume,
+    parsed_jd: ParsedJD,
+    jd_embeddings: np.ndarray | None = None,
+) -> tuple[int, SemanticResult]:
+    model = _get_model()
+    if model is None:
+        return 0, SemanticResult()
+
+    if jd_embeddings is None:
+        # Single request: encode both sides in one call
+        texts = _resume_texts(parsed_resume) + _jd_texts(parsed_jd)
+        encoded_texts.inc(len(texts))
+        embeddings = model.encode(texts, show_progress_bar=False)
+        return _score_embeddings(embeddings[:4], embeddings[4:])
+
+    texts = _resume_texts(parsed_resume)
+    encoded_texts.inc(len(texts))
+    embeddings = model.encode(texts, show_progress_bar=False)
+    return _score_embeddings(embeddings, jd_embeddings)
+
+
+@traced("semantic")
+def compute_semantic_scores(
+    parsed_resumes: list[ParsedResume],
+    parsed_jd: ParsedJD,
+    jd_embeddings: np.ndarray | None = None,
+) -> list[tuple[int, SemanticResult]]:
+    """Score many resumes against one JD with a single batched encode of all resume texts."""
+    model = _get_model()
+    if model is None:
+        return [(0, SemanticResult()) for _ in parsed_resumes]
+    if not parsed_resumes:
+        return []
+    if jd_embeddings is None:
+        jd_embeddings = encode_jd(parsed_jd)
+
+    texts = [text for parsed in parsed_resumes for text in _resume_texts(parsed)]
+    encoded_texts.inc(len(texts))
+    embeddings = model.encode(texts, show_progress_bar=False)
+    return [
+        _score_embeddings(embeddings[i * 4:(i + 1) * 4], jd_embeddings)
+        for i in range(len(parsed_resumes))
+    ]
@@ -1,8 +1,21 @@
 import re
 from app.models.schemas import StructureResult, StructureDetails, ParsedResume
 from app.utils.constants import SECTION_HEADERS
+from app.utils.timing import traced
 
+# Points per check; each of the four groups adds up to 25
+STRUCTURE_POINTS = {
+    "name": 5, "email": 5, "phone": 5, "linkedin": 5, "github": 5,
+    "summary": 4, "experience": 6, "education": 5, "skills": 5, "projects": 5,
+    "length_ideal": 25, "length_acceptable": 15, "length_other": 5,
+    "no_images": 10, "standard_headers": 10, "mostly_standard_headers": 5, "dates": 5,
+}
+# Word counts scored as ideal, and as acceptable around them
+IDEAL_WORD_RANGE = (300, 800)
+ACCEPTABLE_WORD_RANGE = (200, 1000)
 
+
+@traced("structure")
 def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, StructureResult]:
     details = StructureDetails()
     formatting_issues: list[str] = []
@@ -16,23 +29,23 @@ def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, Structure
     details.has_github = bool(parsed_resume.contact.github or parsed_resume.contact.portfolio)
 
     if details.has_name:
-        contact_score += 5
+        contact_score += STRUCTURE_POINTS["name"]
     else:
         formatting_issues.append("No name detected at the top of resume")
     if details.has_email:
-        contact_score += 5
+        contact_score += STRUCTURE_POINTS["email"]
     else:
         formatting_issues.append("No email address found")
     if details.has_phone:
-        contact_score += 5
+        contact_score += STRUCTURE_POINTS["phone"]
     else:
         formatting_issues.append("No phone number found")
     if details.has_linkedin:
-        contact_score += 5
+        contact_score += STRUCTURE_POINTS["linkedin"]
     else:
         formatting_issues.append("No LinkedIn URL found")
     if details.has_github:
-        contact_score += 5
+        contact_score += STRUCTURE_POINTS["github"]
     else:
         formatting_issues.append("No GitHub/Portfolio URL found")
 
@@ -60,23 +73,23 @@ def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, Structure
     )
 
     if details.has_summary:
-        sections_score += 4
+        sections_score += STRUCTURE_POINTS["summary"]
     else:
         formatting_issues.append("Missing Summary/About section")
     if details.has_experience:
-        sections_score += 6
+        sections_score += STRUCTURE_POINTS["experience"]
     else:
         formatting_issues.append("Missing Experience section")
     if details.has_education:
-        sections_score += 5
+        sections_score += STRUCTURE_POINTS["education"]
     else:
         formatting_issues.append("Missing Education section")
     if details.has_skills:
-        sections_score += 5
+        sections_score += STRUCTURE_POINTS["skills"]
     else:
         formatting_issues.append("Missing Skills section")
     if details.has_projects:
-        sections_score += 5
+        sections_score += STRUCTURE_POINTS["projects"]
     else:
         formatting_issues.append("Missing Projects section")
 
@@ -85,24 +98,26 @@ def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, Structure
     details.word_count = wc
     details.estimated_pages = parsed_resume.estimated_pages
 
-    if 300 <= wc <= 800:
-        length_score = 25
-    elif 200 <= wc < 300 or 800 < wc <= 1000:
-        length_score = 15
+    ideal_min, ideal_max = IDEAL_WORD_RANGE
+    acceptable_min, acceptable_max = ACCEPTABLE_WORD_RANGE
+    if ideal_min <= wc <= ideal_max:
+        length_score = STRUCTURE_POINTS["length_ideal"]
+    elif acceptable_min <= wc < ideal_min or ideal_max < wc <= acceptable_max:
+        length_score = STRUCTURE_POINTS["length_acceptable"]
         formatting_issues.append(
-            f"Resume length ({wc} words) is {'short' if wc < 300 else 'long'} for optimal ATS parsing"
+            f"Resume length ({wc} words) is {'short' if wc < ideal_min else 'long'} for optimal ATS parsing"
         )
     else:
-        length_score = 5
+        length_score = STRUCTURE_POINTS["length_other"]
         formatting_issues.append(
-            f"Resume length ({wc} words) is {'too short' if wc < 200 else 'too long'} for ATS"
+            f"Resume length ({wc} words) is {'too short' if wc < acceptable_min else 'too long'} for ATS"
         )
 
     # Formatting (25 pts)
     formatting_score = 0
 
     # No images/tables check (10 pts) — in text mode, usually fine
-    formatting_score += 10
+    formatting_score += STRUCTURE_POINTS["no_images"]
 
     # Standard section headers (10 pts)
     non_standard = 0
@@ -110,10 +125,10 @@ def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, Structure
         if section_name.lower() not in SECTION_HEADERS:
             non_standard += 1
     if non_standard == 0:
-        formatting_score += 10
+        formatting_score += STRUCTURE_POINTS["standard_headers"]
         details.has_standard_headers = True
     elif non_standard <= 2:
-        formatting_score += 5
+        formatting_score += STRUCTURE_POINTS["mostly_standard_headers"]
         details.has_standard_headers = False
         formatting_issues.append("Some non-standard section headers detected")
     else:
@@ -125,7 +140,7 @@ def compute_structure_score(parsed_resume: ParsedResume) -> tuple[int, Structure
         r"(\w+\s+\d{4}|\d{1,2}/\d{4}|\d{4})", parsed_resume.raw_text
     )
     if dates:
-        formatting_score += 5
+        formatting_score += STRUCTURE_POINTS["dates"]
         details.has_consistent_dates = True
 
     details.formatting_issues = formatting_issues
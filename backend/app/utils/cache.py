@@ -0,0 +1,179 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Any | None:
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total, 3) if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hit_ratio}
+
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL.
+
+    With ``max_bytes`` the least recently used entries are also evicted to
+    keep the total size of the values under that budget; values are then
+    expected to be ``str``/``bytes`` or tuples of them (anything else
+    counts as its ``sys.getsizeof``).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, size = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self.total_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            self._entries[key] = (time.time() + self.ttl_seconds, value, size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class SQLiteCache:
+    """Persistent cache in a local SQLite file; values are stored as JSON."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float, table: str = "cache"):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                f"UPDATE {self._table} SET last_used = ? WHERE key = ?", (now, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now),
+            )
+            self._conn.execute(f"DELETE FROM {self._table} WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                f"DELETE FROM {self._table} WHERE key IN ("
+                f"SELECT key FROM {self._table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table}")
+            self._conn.commit()
+
+
+class TieredCache:
+    """A memory cache in front of a persistent one; persistent hits are promoted to memory."""
+
+    def __init__(self, memory: CacheBackend, persistent: CacheBackend):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, key: str) -> Any | None:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.persistent.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        self.persistent.set(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.persistent.clear()
@@ -0,0 +1,161 @@
+import json
+from typing import Any, Callable
+
+from app.utils.llm_helpers import parse_llm_json
+
+# (field, array index or None for the whole field, decoded value)
+FieldEvent = tuple[str, int | None, Any]
+FieldCallback = Callable[[str, int | None, Any], None]
+
+
+class IncrementalJSONParser:
+    """Parse a streamed JSON object and report fields as soon as they close.
+
+    Emits ``(field, None, value)`` for every completed top-level field and
+    ``(field, index, element)`` for every completed element of a top-level
+    array, so ``fit_explanation`` or each ``bullet_changes`` entry can be
+    used before the rest of the response has been generated. Text before the
+    opening brace (such as a Markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.result: dict = {}
+        self._text = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._done = False
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = True
+        self._key: str | None = None
+        self._value_start: int | None = None
+        self._element_start: int | None = None
+        self._element_index = 0
+
+    def feed(self, chunk: str) -> list[FieldEvent]:
+        self._text += chunk
+        events: list[FieldEvent] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            if self._done:
+                break
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._close_string(i, events)
+                continue
+
+            if self._start is None:
+                if c == "{":
+                    self._start = i
+                    self._stack.append("{")
+                continue
+
+            if c.isspace():
+                continue
+
+            depth = len(self._stack)
+            in_array = depth == 2 and self._stack[-1] == "["
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._mark_value_start(i, depth, in_array)
+            elif c == ":" and depth == 1 and self._expect_key:
+                self._expect_key = False
+                self._value_start = None
+            elif c in "{[":
+                self._mark_value_start(i, depth, in_array)
+                if depth == 1 and c == "[":
+                    self._element_index = 0
+                self._stack.append(c)
+            elif c in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if in_array and c == "]":
+                    self._emit_element(i, events)  # trailing scalar element
+                if depth == 2 and self._stack[-1] == "[" and self._element_start is not None:
+                    self._emit_element(i + 1, events)
+                elif depth == 1 and self._value_start is not None:
+                    self._emit_field(i + 1, events)
+                elif depth == 0:
+                    if self._value_start is not None:
+                        self._emit_field(i, events)
+                    self._done = True
+            elif c == ",":
+                if depth == 1:
+                    if self._value_start is not None:
+                        self._emit_field(i, events)
+                    self._expect_key = True
+                elif in_array:
+                    self._emit_element(i, events)
+            else:
+                self._mark_value_start(i, depth, in_array)
+
+        self._pos = len(text)
+        return events
+
+    def close(self) -> dict:
+        """Return the full object, falling back to a lenient parse of the raw text."""
+        if self._done:
+            return self.result
+        return parse_llm_json(self._text) or self.result
+
+    def _mark_value_start(self, i: int, depth: int, in_array: bool) -> None:
+        if depth == 1 and not self._expect_key and self._value_start is None:
+            self._value_start = i
+        elif in_array and self._element_start is None:
+            self._element_start = i
+
+    def _close_string(self, i: int, events: list[FieldEvent]) -> None:
+        depth = len(self._stack)
+        if depth == 1 and self._expect_key:
+            self._key = json.loads(self._text[self._string_start:i + 1])
+        elif depth == 1 and self._value_start == self._string_start:
+            self._emit_field(i + 1, events)
+        elif depth == 2 and self._stack[-1] == "[" and self._element_start == self._string_start:
+            self._emit_element(i + 1, events)
+
+    def _emit_field(self, end: int, events: list[FieldEvent]) -> None:
+        raw = self._text[self._value_start:end].strip()
+        self._value_start = None
+        if self._key is None or not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        self.result[self._key] = value
+        events.append((self._key, None, value))
+
+    def _emit_element(self, end: int, events: list[FieldEvent]) -> None:
+        if self._element_start is None:
+            return
+        raw = self._text[self._element_start:end].strip()
+        self._element_start = None
+        if self._key is None or not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        events.append((self._key, self._element_index, value))
+        self._element_index += 1
+
+
+def replay_fields(result: dict, callback: FieldCallback) -> None:
+    """Report an already complete object through the same events as a stream."""
+    for key, value in result.items():
+        if isinstance(value, list):
+            for index, element in enumerate(value):
+                callback(key, index, element)
+        callback(key, None, value)
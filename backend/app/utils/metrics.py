@@ -0,0 +1,155 @@
+import bisect
+import os
+import threading
+from typing import Callable
+
+from app.config import get_settings
+
+# Seconds; spans a fast keyword pass up to a slow LLM call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, *extra: str) -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    parts.extend(label for label in extra if label)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, process: str = "") -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels, process)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self, process: str = "") -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = _format_labels(self.labelnames, labels, process, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                label_str = _format_labels(self.labelnames, labels, process)
+                lines.append(f"{self.name}_sum{label_str} {total}")
+                lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """A counter or gauge read from existing state (e.g. cache stats) when scraped."""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: tuple[str, ...], read: Callable[[], dict]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = labelnames
+        self.read = read
+
+    def render(self, process: str = "") -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.read().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels, process)} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text format.
+
+    Each server process keeps its own values; they are not aggregated
+    across gunicorn workers (see README.md, "Multi-worker serving").
+
+    Recording is a bucket lookup and a locked add; with ``enabled`` off it
+    returns immediately.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(self, name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), **kwargs) -> Histogram:
+        return self._add(Histogram(self, name, help, labelnames, **kwargs))
+
+    def callback(
+        self, name: str, help: str, kind: str, labelnames: tuple[str, ...], read: Callable[[], dict],
+    ) -> CallbackMetric:
+        return self._add(CallbackMetric(name, help, kind, labelnames, read))
+
+    def _add(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        # Every series carries the worker's pid: behind a multi-worker server each scrape
+        # reaches one worker, and the label keeps the workers' counters from mixing
+        process = f'pid="{os.getpid()}"'
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(process))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(enabled=get_settings().metrics_enabled)
+
+stage_seconds = registry.histogram(
+    "ats_stage_duration_seconds", "Time spent in each pipeline stage", ("stage",),
+)
+fuzzy_comparisons = registry.counter(
+    "ats_fuzzy_comparisons_total", "rapidfuzz comparisons made while matching keywords",
+)
+encoded_texts = registry.counter(
+    "ats_encoded_texts_total", "Texts encoded by the sentence transformer",
+)
+llm_prompt_tokens = registry.counter(
+    "ats_llm_prompt_tokens_total", "Estimated prompt tokens sent to the LLM provider",
+)
+
@@ -0,0 +1,150 @@
+import asyncio
+import hmac
+import itertools
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# A thread whose innermost Python frame is in one of these is parked, not working:
+# lock and condition waits, the event loop's selector, an idle executor worker
+_IDLE_FILES = {"threading.py", "selectors.py", "queue.py"}
+_IDLE_FUNCTIONS = {("thread.py", "_worker")}
+
+
+class StackSampler:
+    """Samples the Python stacks of every thread on an interval, in a background thread.
+
+    Samples are folded into ``frame;frame;frame count`` lines (the collapsed
+    format read by flamegraph.pl, speedscope and inferno). Threads parked in
+    a wait are skipped, so the profile shows where work happened. All threads
+    are sampled, so other requests running at the same time show up too; the
+    scoring pool's worker processes do not.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _is_idle(frame) -> bool:
+    filename = Path(frame.f_code.co_filename).name
+    return filename in _IDLE_FILES or (filename, frame.f_code.co_name) in _IDLE_FUNCTIONS
+
+
+class ProfilerMiddleware:
+    """Profiles selected requests end to end and writes one folded-stack file per request.
+
+    A request is profiled when it carries ``X-Profile-Token`` equal to the
+    configured admin token, or as every ``sample_every``-th request. The file
+    is ``<directory>/<request id>.folded``; the id comes from ``X-Request-ID``
+    or is generated, and is returned in ``X-Profile-Id``. The oldest files
+    are deleted to stay within ``max_files`` and ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        token: str = "",
+        sample_every: int = 0,
+        max_files: int = 200,
+        max_bytes: int = 100 * 1024 * 1024,
+        interval: float = 0.005,
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token
+        self.sample_every = sample_every
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._requests = itertools.count(1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex
+        # Used as a file name
+        request_id = "".join(c for c in request_id if c.isalnum() or c in "-_")[:64] or uuid.uuid4().hex
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = request_id
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            await asyncio.to_thread(self._write, request_id, sampler.folded())
+            logger.info(f"Profiled {scope['path']} ({elapsed:.3f}s) as {request_id}")
+
+    def _selected(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile-token" and hmac.compare_digest(value, self.token.encode("latin-1")):
+                    return True
+        return self.sample_every > 0 and next(self._requests) % self.sample_every == 0
+
+    def _write(self, request_id: str, folded: str) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{request_id}.folded").write_text(folded, encoding="utf-8")
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Could not write profile {request_id}: {e}")
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.folded"), key=lambda f: f.stat().st_mtime, reverse=True)
+        total = 0
+        for index, file in enumerate(files):
+            total += file.stat().st_size
+            if index >= self.max_files or total > self.max_bytes:
+                file.unlink(missing_ok=True)
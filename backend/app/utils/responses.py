@@ -0,0 +1,45 @@
+import json
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(Response):
+    """JSON response serialized by pydantic's core straight to bytes.
+
+    Returning this from a route skips FastAPI's re-validation of the model
+    against ``response_model`` and its ``jsonable_encoder`` pass, which
+    together cost more than the serialization itself for large responses.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: BaseModel,
+        include: set[str] | None = None,
+        exclude: set[str] | None = None,
+        extra: dict | None = None,
+        **kwargs,
+    ):
+        content = model.model_dump_json(include=include, exclude=exclude)
+        if extra:
+            # Splice extra top-level keys into the serialized object rather than re-encoding it
+            tail = json.dumps(extra)[1:]
+            content = content[:-1] + ("," if content != "{}" else "") + tail
+        super().__init__(content=content, **kwargs)
+
+
+def select_fields(
+    compact: bool, fields: str, compact_exclude: set[str],
+) -> tuple[set[str] | None, set[str] | None]:
+    """Turn the ``compact``/``fields`` request options into (include, exclude) top-level field sets.
+
+    ``fields`` alone returns only the named fields. ``compact`` drops
+    ``compact_exclude`` (input echoes and per-item detail) except any of
+    them named in ``fields``.
+    """
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if compact:
+        return None, (compact_exclude - requested) or None
+    return requested or None, None
@@ -0,0 +1,43 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils import timing
+
+
+class ServerTimingMiddleware:
+    """Collects the stage spans of each request and reports them in a ``Server-Timing`` header.
+
+    The top-level stages are ``parse``, ``keyword``, ``semantic``,
+    ``structure``, ``llm`` (each upstream LLM call) and ``optimize``
+    (applying the rewrite, without its LLM call). A few stages are detail
+    nested inside another and must not be added to it: ``resume_parse``
+    and ``jd_parse`` are the two branches of ``parse``, ``keybert`` is part
+    of ``jd_parse``, and ``assemble`` and ``validate`` are part of
+    ``optimize``. Top-level stages can still run concurrently (JD parsing
+    alongside structure scoring, the two LLM calls of /optimize together),
+    so ``total`` is the wall time of the request rather than their sum.
+    Streaming responses send their headers before the work is done and
+    only show what preceded it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                breakdown = timing.current_breakdown()
+                breakdown["total"] = round((time.perf_counter() - started) * 1000, 1)
+                MutableHeaders(scope=message)["Server-Timing"] = timing.server_timing(breakdown)
+            await send(message)
+
+        with timing.collecting():
+            await self.app(scope, receive, send_with_timing)
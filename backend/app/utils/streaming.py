@@ -0,0 +1,100 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.json_stream import FieldCallback
+
+PartialFactory = Callable[[str], FieldCallback]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class StreamAwareGZipMiddleware:
+    """``GZipMiddleware`` that passes NDJSON responses through uncompressed.
+
+    Compressing a stream makes gzip hold lines back until its buffer fills,
+    so a response whose content type is NDJSON is sent straight to the
+    client instead of through the gzip responder.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def app(scope: Scope, receive: Receive, gzip_send: Send) -> None:
+            target = gzip_send
+
+            async def choose(message: Message) -> None:
+                nonlocal target
+                if message["type"] == "http.response.start":
+                    content_type = Headers(raw=message["headers"]).get("content-type", "")
+                    target = send if content_type.startswith(NDJSON_MEDIA_TYPE) else gzip_send
+                await target(message)
+
+            await self.app(scope, receive, choose)
+
+        await GZipMiddleware(app, self.minimum_size, self.compresslevel)(scope, receive, send)
+
+
+def ndjson_stream(
+    run: Callable[[PartialFactory], Awaitable[BaseModel]],
+    include: set[str] | None = None,
+    exclude: set[str] | None = None,
+) -> StreamingResponse:
+    """Stream partial LLM fields and then the final result as NDJSON lines.
+
+    ``run`` gets a factory that returns a field callback for a stage name;
+    every field reported through it is forwarded to the client immediately
+    as ``{"type": "partial", "stage", "field", "index", "value"}``. The last
+    line is ``{"type": "result", "data": ...}`` (limited to ``include`` /
+    ``exclude`` fields) or ``{"type": "error", ...}``.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def partial(stage: str) -> FieldCallback:
+        def on_field(field: str, index: int | None, value) -> None:
+            queue.put_nowait({
+                "type": "partial", "stage": stage,
+                "field": field, "index": index, "value": value,
+            })
+        return on_field
+
+    async def events():
+        task = asyncio.create_task(run(partial))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                yield json.dumps(event) + "\n"
+            try:
+                result = task.result()
+            except Exception as e:
+                yield json.dumps({"type": "error", "message": str(e)}) + "\n"
+            else:
+                data = result.model_dump_json(include=include, exclude=exclude)
+                yield '{"type": "result", "data": ' + data + "}\n"
+        finally:
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(events(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def ndjson_events(events: AsyncIterator[dict]) -> StreamingResponse:
+    """Stream already-shaped events, one JSON object per line."""
+    async def lines():
+        async for event in events:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,83 @@
+import contextvars
+import functools
+import inspect
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+
+from app.utils.metrics import stage_seconds
+
+Span = tuple[str, float]  # (stage name, seconds)
+
+# The spans of the request being handled. The list itself is shared by every
+# task and thread that inherits the context, so they all add to one breakdown.
+_spans: contextvars.ContextVar[list[Span] | None] = contextvars.ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def collecting():
+    """Collect the spans finished inside the block into the yielded list."""
+    spans: list[Span] = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add a finished span to the current request (if any) and to the stage histogram."""
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+    stage_seconds.observe(seconds, name)
+
+
+def record_all(spans: list[Span]) -> None:
+    """Adopt spans timed elsewhere, e.g. returned by a scoring pool process."""
+    for name, seconds in spans:
+        record(name, seconds)
+
+
+@contextmanager
+def span(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def traced(name: str):
+    """Decorator form of ``span`` for plain and async functions."""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def submit(executor: Executor, fn, *args) -> Future:
+    """``executor.submit`` that carries the caller's context (and so its span list) into the thread."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def current_breakdown() -> dict[str, float]:
+    """Milliseconds per stage for the current request, summed over repeated stages."""
+    breakdown: dict[str, float] = {}
+    for name, seconds in _spans.get() or ():
+        breakdown[name] = breakdown.get(name, 0.0) + seconds * 1000
+    return {name: round(ms, 1) for name, ms in breakdown.items()}
+
+
+def server_timing(breakdown: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={ms}" for name, ms in breakdown.items())
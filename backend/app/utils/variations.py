@@ -124,11 +124,21 @@ VARIATIONS: dict[str, list[str]] = {
 }
 
 
+_variation_index: dict[str, list[str]] | None = None
+
+
+def build_variation_index() -> dict[str, list[str]]:
+    """Map every lowercased canonical name and variation to its variation list (first entry wins)."""
+    global _variation_index
+    if _variation_index is None:
+        index: dict[str, list[str]] = {}
+        for canonical, variations in VARIATIONS.items():
+            for name in [v.lower() for v in variations] + [canonical.lower()]:
+                index.setdefault(name, variations)
+        _variation_index = index
+    return _variation_index
+
+
 def get_all_variations(keyword: str) -> list[str]:
     keyword_lower = keyword.lower().strip()
-    for canonical, variations in VARIATIONS.items():
-        if keyword_lower in [v.lower() for v in variations]:
-            return variations
-        if keyword_lower == canonical.lower():
-            return variations
-    return [keyword_lower]
+    return build_variation_index().get(keyword_lower, [keyword_lower])
@@ -0,0 +1,27 @@
+"""Gunicorn settings for multi-worker serving — run with: gunicorn -c gunicorn.conf.py app.main:app
+
+The app and its models are loaded once in the master and the workers are
+forked from it, so they share the model weights copy-on-write. Set
+GUNICORN_PRELOAD=false to load everything separately in each worker instead
+(for comparison with scripts/worker_rss.py). Keep SCORING_WORKERS=0 here:
+a scoring pool would start private model copies in every worker.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '7860')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() != "false"
+timeout = 120
+
+
+def on_starting(server):
+    if preload_app:
+        from app.preload import preload
+        preload()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from app.preload import preload
+        preload(freeze=False)
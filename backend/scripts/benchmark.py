@@ -0,0 +1,204 @@
+"""Per-layer micro-benchmarks — run with: python scripts/benchmark.py [--repeat 30] [--update-baseline]
+
+Times each deterministic stage (resume and JD parsing, LaTeX parsing and
+assembly, keyword, semantic and structure scoring, and the whole analysis
+without the LLM) on small, medium and huge inputs from generate_corpus.py,
+and prints p50/p95/p99 latency with the peak and retained memory of one
+call (tracemalloc).
+
+The p95 of the small and medium inputs is checked against the REQUIREMENTS.md
+targets (keyword matching < 100 ms, semantic scoring < 300 ms, analysis
+without LLM < 2 s); the huge inputs are reported only. A baseline file may
+set its own "targets_ms" for the machine it was recorded on; those replace
+the REQUIREMENTS.md values and are printed when they are looser. Results are
+compared with the baseline file written by --update-baseline; with
+--max-regression a p50 that many times slower than the baseline also fails.
+The exit status is non-zero when a check fails.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, ".")
+
+from app.services.analysis_pipeline import score_resume
+from app.services.jd_parser import parse_jd
+from app.services.keyword_matcher import compute_keyword_score
+from app.services.latex_assembler import assemble_optimized_latex
+from app.services.latex_parser import parse_latex_resume
+from app.services.resume_parser import latex_to_plain, parse_resume
+from app.services.semantic_scorer import _get_model, compute_semantic_score
+from app.services.structure_scorer import compute_structure_score
+from generate_corpus import generate_pair
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+SEED = 49
+
+# Milliseconds at p95, from REQUIREMENTS.md "Performance Targets"
+TARGETS_MS = {
+    "compute_keyword_score": 100.0,
+    "compute_semantic_score": 300.0,
+    "analysis_without_llm": 2000.0,
+}
+
+# Corpus generator knobs per size; huge is a stress shape, not a target
+SIZES = {
+    "small": {"roles": 1, "bullets": 3, "projects": 1, "skills": 8, "requirements": 6},
+    "medium": {"roles": 4, "bullets": 6, "projects": 3, "skills": 30, "requirements": 20},
+    "huge": {"roles": 25, "bullets": 20, "projects": 10, "skills": 300, "requirements": 120},
+}
+ENFORCED_SIZES = ("small", "medium")
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_cases(size: str) -> list[tuple[str, Callable[[], object]]]:
+    # The same seed gives the same resume content in both formats
+    plain = generate_pair(SEED, fmt="plain", **SIZES[size])
+    resume_text, jd_text = plain["resume"], plain["jd"]
+    latex_source = generate_pair(SEED, fmt="latex", **SIZES[size])["resume"]
+
+    parsed_resume = parse_resume(resume_text)
+    parsed_jd = parse_jd(jd_text)
+    latex_map = parse_latex_resume(latex_source)
+    # Rewrite every bullet, as a full optimization round would
+    optimized_bullets = {
+        bullet.line_number: f"\\resumeItem{{Rewrote: {bullet.content}}}"
+        for entry in (*latex_map.experience_entries, *latex_map.project_entries)
+        for bullet in entry.bullets
+    }
+
+    return [
+        ("parse_resume", lambda: parse_resume(resume_text)),
+        ("latex_to_plain", lambda: latex_to_plain(latex_source)),
+        ("parse_latex_resume", lambda: parse_latex_resume(latex_source)),
+        ("parse_jd", lambda: parse_jd(jd_text)),
+        ("compute_keyword_score", lambda: compute_keyword_score(parsed_resume, parsed_jd)),
+        ("compute_semantic_score", lambda: compute_semantic_score(parsed_resume, parsed_jd)),
+        ("compute_structure_score", lambda: compute_structure_score(parsed_resume)),
+        ("assemble_optimized_latex", lambda: assemble_optimized_latex(
+            latex_map, optimized_skills="Python, FastAPI", optimized_bullets=optimized_bullets,
+        )),
+        ("analysis_without_llm", lambda: score_resume(resume_text, jd_text)),
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - started) * 1000)
+
+    # One more call under tracemalloc; it slows the call down, so it isn't timed
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(durations, 0.5), 3),
+        "p95_ms": round(percentile(durations, 0.95), 3),
+        "p99_ms": round(percentile(durations, 0.99), 3),
+        "max_ms": round(max(durations), 3),
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((after - before) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls before timing")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="run only these cases")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="fail when a p50 exceeds the baseline by this factor, e.g. 1.5")
+    args = parser.parse_args()
+
+    model_loaded = _get_model() is not None
+    if not model_loaded:
+        print("warning: the sentence transformer is unavailable; semantic timings exclude encoding\n")
+
+    baseline = {}
+    targets = dict(TARGETS_MS)
+    if args.baseline.exists():
+        saved = json.loads(args.baseline.read_text())
+        baseline = saved.get("results", {})
+        targets.update(saved.get("targets_ms", {}))
+    elif not args.update_baseline:
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one\n")
+    for name, target in targets.items():
+        if target > TARGETS_MS[name]:
+            print(f"note: {name} is checked against {target:.0f} ms from the baseline, "
+                  f"not the {TARGETS_MS[name]:.0f} ms target")
+
+    results: dict[str, dict[str, float]] = {}
+    failures: list[str] = []
+    print(f"{'case':<40} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'peak KB':>9} {'kept KB':>9}  vs baseline")
+    for size in args.sizes:
+        for name, fn in build_cases(size):
+            if args.only and name not in args.only:
+                continue
+            key = f"{name}/{size}"
+            stats = measure(fn, args.repeat, args.warmup)
+            results[key] = stats
+
+            notes = []
+            previous = baseline.get(key)
+            if previous and previous["p50_ms"] > 0:
+                ratio = stats["p50_ms"] / previous["p50_ms"]
+                notes.append(f"{ratio:.2f}x p50")
+                if args.max_regression is not None and ratio > args.max_regression:
+                    failures.append(f"{key}: p50 {stats['p50_ms']} ms is {ratio:.2f}x the baseline")
+            target = targets.get(name)
+            if target is not None and size in ENFORCED_SIZES and stats["p95_ms"] > target:
+                notes.append(f"OVER {target:.0f} ms TARGET")
+                failures.append(f"{key}: p95 {stats['p95_ms']} ms exceeds the {target:.0f} ms target")
+
+            print(
+                f"{key:<40} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                f"{stats['max_ms']:>9.2f} {stats['peak_kb']:>9.1f} {stats['retained_kb']:>9.1f}  {' '.join(notes)}"
+            )
+
+    if args.update_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": {
+                "platform": platform.platform(),
+                "arch": platform.machine(),
+                "cpus": os.cpu_count(),
+            },
+            "semantic_model_loaded": model_loaded,
+            "repeat": args.repeat,
+            "targets_ms": targets,
+            "results": merged,
+        }, indent=2, sort_keys=True) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
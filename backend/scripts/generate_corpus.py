@@ -0,0 +1,351 @@
+"""Synthetic resume/JD corpus — run with: python scripts/generate_corpus.py [--count 1000] [--seed 0] [--output corpus.jsonl]
+
+Writes one JSON object per line, each a resume (plain text or LaTeX) and a
+job description to score it against:
+
+    {"id", "seed", "shape", "format", "resume", "jd", "overlap",
+     "jd_skills", "resume_skills", "matched_skills"}
+
+Records are generated and written one at a time, so the corpus can be any
+size. Each record is seeded from (seed, index) alone, so the same arguments
+always give the same corpus and record N doesn't depend on --count.
+
+Plain resumes use the headings and "Title at Company | Jan 2020 - Present"
+lines resume_parser splits on; LaTeX resumes use the \\resumeSubheading,
+\\resumeItem and \\resumeProjectHeading macros latex_parser reads. JDs use
+the headings jd_parser detects. --overlap is the share of the JD's skills
+the resume lists (matched_skills is the exact list). --shape picks a
+pathological input: a huge skills list, thousands of bullets, or bullets
+nested --depth braces deep; "mixed" draws a shape per record.
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Iterator, TextIO
+
+SKILL_POOL = [
+    "Python", "Java", "Go", "Rust", "C++", "C#", "Scala", "Kotlin", "TypeScript", "JavaScript", "SQL",
+    "React", "Next.js", "Vue.js", "Angular", "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring Boot",
+    "GraphQL", "gRPC", "REST APIs", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra",
+    "Kafka", "RabbitMQ", "Airflow", "Spark", "Hadoop", "dbt", "Snowflake", "BigQuery", "pandas", "NumPy",
+    "PyTorch", "TensorFlow", "scikit-learn", "Docker", "Kubernetes", "Terraform", "Ansible", "Helm",
+    "AWS", "GCP", "Azure", "Lambda", "S3", "CI/CD", "GitHub Actions", "Jenkins", "Git", "Linux",
+    "Prometheus", "Grafana", "OpenTelemetry", "Tailwind CSS", "WebSocket", "OAuth", "Microservices",
+]
+
+# No title may start with a resume section heading ("Research ...", "Profile ..."),
+# or the parser would start a new section there
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Engineer", "Full Stack Developer",
+    "Data Engineer", "Platform Engineer", "Machine Learning Engineer", "Site Reliability Engineer",
+    "Staff Engineer", "Frontend Engineer",
+]
+COMPANIES = [
+    "TechCorp", "DataCo", "StartupInc", "Cloudworks", "Finlytics", "Medisoft", "Shipfast", "Brightpath",
+    "Northwind", "Bluefin Labs", "Quantive", "Orbital Systems",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+LEVELS = ["Junior", "Mid-level", "Senior", "Staff", "Lead"]
+JD_TITLES = ["Software Engineer", "Backend Engineer", "Data Engineer", "Platform Engineer", "Frontend Engineer"]
+
+BULLETS = [
+    "Built a real-time analytics dashboard with {0} and {1}, used by 200 internal analysts",
+    "Designed APIs in {0} serving 10M requests per day at p99 under 80 ms",
+    "Migrated batch jobs to {0} on {1}, cutting failed runs by 70%",
+    "Introduced {0} and {1} pipelines, reducing release time from days to hours",
+    "Tuned {0} indexes and query plans, lowering median report latency by 45%",
+    "Led the move from a monolith to {0} services backed by {1}",
+    "Cut infrastructure cost by 30% by right-sizing {0} clusters and caching in {1}",
+    "Mentored four engineers and ran weekly design reviews on {0} and {1} work",
+]
+
+# jd_parser switches section on any line containing a heading word, anywhere in the
+# line, so duty lines must avoid "role", "summary", "requirements", "benefits" and the like
+DUTIES = [
+    "Design and build scalable services with {0}",
+    "Own the reliability of production systems running on {0}",
+    "Partner with product and design to ship features end to end",
+    "Review code and mentor engineers on {0} best practices",
+    "Improve observability and incident response for {0} workloads",
+    "Evolve our data model and storage on {0}",
+]
+
+SHAPES = {
+    "normal": {},
+    "huge_skills": {"skills": 2000},
+    "many_bullets": {"roles": 40, "bullets": 75},
+    "deep_nesting": {"depth": 200},
+}
+
+LATEX_PREAMBLE = r"""\documentclass[letterpaper,11pt]{article}
+\usepackage{hyperref}
+\newcommand{\resumeItem}[1]{\item\small{{#1 \vspace{-2pt}}}}
+\newcommand{\resumeSubheading}[4]{\item\textbf{#1} \hfill #2 \\ \textit{#3} \hfill \textit{#4}}
+\newcommand{\resumeProjectHeading}[2]{\item #1 \hfill #2}
+\newcommand{\resumeSubHeadingListStart}{\begin{itemize}}
+\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
+\newcommand{\resumeItemListStart}{\begin{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}}
+"""
+
+
+def skill_name(i: int) -> str:
+    # Past the pool, synthesize distinct names so huge skill lists don't repeat
+    if i < len(SKILL_POOL):
+        return SKILL_POOL[i]
+    return f"{SKILL_POOL[i % len(SKILL_POOL)]}{i // len(SKILL_POOL)}"
+
+
+def _nested(text: str, depth: int, latex: bool) -> str:
+    if depth <= 0:
+        return text
+    if latex:
+        return "\\textbf{" * depth + text + "}" * depth
+    return "{" * depth + text + "}" * depth
+
+
+def _escape(text: str) -> str:
+    # "45%" would start a LaTeX comment and "C#" is a macro parameter
+    return text.replace("%", r"\%").replace("#", r"\#").replace("&", r"\&")
+
+
+def _pick_skills(rng: random.Random, skills: int, requirements: int, overlap: float) -> tuple[list[str], list[str]]:
+    """Return (JD skills, resume skills) sharing round(overlap * requirements) names."""
+    universe = [skill_name(i) for i in range(max(len(SKILL_POOL), skills + requirements))]
+    jd_skills = rng.sample(universe, min(requirements, len(universe)))
+    shared = jd_skills[:min(round(overlap * len(jd_skills)), skills)]
+    jd_set = set(jd_skills)
+    others = [s for s in universe if s not in jd_set]
+    resume_skills = shared + rng.sample(others, min(skills - len(shared), len(others)))
+    rng.shuffle(resume_skills)
+    return jd_skills, resume_skills
+
+
+def _roles(rng: random.Random, roles: int, bullets: int, resume_skills: list[str]) -> list[dict]:
+    pool = resume_skills or SKILL_POOL
+    start_year = 2024 - 2 * roles
+    entries = []
+    for r in range(roles):
+        year = start_year + 2 * (roles - 1 - r)
+        end = "Present" if r == 0 else f"{rng.choice(MONTHS)} {year + 2}"
+        entries.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "dates": f"{rng.choice(MONTHS)} {year} - {end}",
+            "bullets": [rng.choice(BULLETS).format(rng.choice(pool), rng.choice(pool)) for _ in range(bullets)],
+        })
+    return entries
+
+
+def plain_resume(name: str, summary: str, roles: list[dict], projects: list[dict], skills: list[str], depth: int) -> str:
+    experience = "\n\n".join(
+        f"{role['title']} at {role['company']} | {role['dates']}\n"
+        + "\n".join(f"- {_nested(b, depth if i == 0 else 0, False)}" for i, b in enumerate(role["bullets"]))
+        for role in roles
+    )
+    project_text = "\n\n".join(
+        f"{project['name']} | {project['year']}\n" + "\n".join(f"- {b}" for b in project["bullets"])
+        for project in projects
+    )
+    email = name.lower().replace(" ", ".") + "@example.com"
+    return f"""{name}
+{email} | 555-123-4567 | https://github.com/{name.split()[0].lower()}
+
+SUMMARY
+{summary}
+
+SKILLS
+{", ".join(skills)}
+
+EXPERIENCE
+{experience}
+
+PROJECTS
+{project_text}
+
+EDUCATION
+BS Computer Science, State University
+2010 - 2014
+"""
+
+
+def latex_resume(name: str, summary: str, roles: list[dict], projects: list[dict], skills: list[str], depth: int) -> str:
+    experience = "\n".join(
+        f"    \\resumeSubheading{{{role['company']}}}{{{role['dates'].replace(' - ', ' -- ')}}}"
+        f"{{{role['title']}}}{{Remote}}\n"
+        "      \\resumeItemListStart\n"
+        + "\n".join(
+            f"        \\resumeItem{{{_nested(_escape(b), depth if i == 0 else 0, True)}}}"
+            for i, b in enumerate(role["bullets"])
+        )
+        + "\n      \\resumeItemListEnd"
+        for role in roles
+    )
+    project_text = "\n".join(
+        # Flat arguments: latex_parser's heading pattern doesn't reach into nested braces
+        f"      \\resumeProjectHeading{{{project['name']} $|$ {_escape(project['stack'])}}}{{{project['year']}}}\n"
+        "          \\resumeItemListStart\n"
+        + "\n".join(f"            \\resumeItem{{{_escape(b)}}}" for b in project["bullets"])
+        + "\n          \\resumeItemListEnd"
+        for project in projects
+    )
+    # Grouped like the categorized skills block in REQUIREMENTS.md
+    skill_lines = " \\\\\n".join(
+        f"     \\textbf{{Group {g // 8 + 1}}}{{: {_escape(', '.join(skills[g:g + 8]))}}}"
+        for g in range(0, len(skills), 8)
+    )
+    email = name.lower().replace(" ", ".") + "@example.com"
+    return LATEX_PREAMBLE + f"""\\begin{{document}}
+\\begin{{center}}
+    \\textbf{{\\Huge {name}}} \\\\
+    \\href{{mailto:{email}}}{{{email}}} $|$ 555-123-4567
+\\end{{center}}
+\\section{{About}}
+{_escape(summary)}
+\\section{{Experience}}
+  \\resumeSubHeadingListStart
+{experience}
+  \\resumeSubHeadingListEnd
+\\section{{Projects}}
+    \\resumeSubHeadingListStart
+{project_text}
+    \\resumeSubHeadingListEnd
+\\section{{Technical Skills}}
+ \\begin{{itemize}}[leftmargin=0.15in, label={{}}]
+    \\small{{\\item{{
+{skill_lines}
+    }}}}
+ \\end{{itemize}}
+\\section{{Education}}
+BS Computer Science, State University, 2010 -- 2014
+\\end{{document}}
+"""
+
+
+def job_description(rng: random.Random, jd_skills: list[str]) -> str:
+    level = rng.choice(LEVELS)
+    title = f"{level} {rng.choice(JD_TITLES)}"
+    split = max(1, (2 * len(jd_skills)) // 3)
+    required, preferred = jd_skills[:split], jd_skills[split:]
+    duties = [rng.choice(DUTIES).format(rng.choice(jd_skills or SKILL_POOL)) for _ in range(max(3, len(jd_skills) // 4))]
+    years = {"Junior": 1, "Mid-level": 3, "Senior": 5, "Staff": 8, "Lead": 10}[level]
+    lines = [
+        title,
+        "",
+        "Overview",
+        f"{rng.choice(COMPANIES)} is hiring a {title} to help build the platform behind our products.",
+        "",
+        "Responsibilities:",
+        *(f"- {d}" for d in duties),
+        "",
+        "Required Skills:",
+        f"- {years}+ years of professional software experience",
+        *(f"- {s}" for s in required),
+        "",
+        "Preferred Qualifications:",
+        *(f"- Experience with {s}" for s in preferred),
+        "",
+        "Benefits:",
+        "- Remote-friendly team and flexible hours",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def generate_pair(
+    seed: int,
+    index: int = 0,
+    fmt: str = "plain",
+    roles: int = 4,
+    bullets: int = 5,
+    projects: int = 2,
+    skills: int = 25,
+    requirements: int = 15,
+    overlap: float = 0.6,
+    depth: int = 0,
+) -> dict:
+    """Build one resume/JD record; the same arguments always give the same record."""
+    rng = random.Random(f"{seed}:{index}")
+    jd_skills, resume_skills = _pick_skills(rng, skills, requirements, overlap)
+    roles_data = _roles(rng, roles, bullets, resume_skills)
+    pool = resume_skills or SKILL_POOL
+    projects_data = [
+        {
+            "name": f"Project {chr(65 + p % 26)}{p // 26 or ''}",
+            "stack": rng.choice(pool),
+            "year": 2015 + p % 10,
+            "bullets": [rng.choice(BULLETS).format(rng.choice(pool), rng.choice(pool)) for _ in range(2)],
+        }
+        for p in range(projects)
+    ]
+    name = f"{rng.choice(['Alex', 'Jordan', 'Sam', 'Priya', 'Wei', 'Maria'])} {rng.choice(['Johnson', 'Lee', 'Garcia', 'Patel', 'Chen', 'Smith'])}"
+    summary = f"Engineer with {2 * roles + 1} years of experience building products with {', '.join(pool[:3])}."
+
+    if fmt == "mixed":
+        fmt = rng.choice(["plain", "latex"])
+    build = latex_resume if fmt == "latex" else plain_resume
+    matched = sorted(set(jd_skills) & set(resume_skills))
+    return {
+        "id": f"{seed}-{index}",
+        "seed": seed,
+        "format": fmt,
+        "resume": build(name, summary, roles_data, projects_data, resume_skills, depth),
+        "jd": job_description(rng, jd_skills),
+        "overlap": round(len(matched) / len(jd_skills), 3) if jd_skills else 0.0,
+        "jd_skills": jd_skills,
+        "resume_skills": resume_skills,
+        "matched_skills": matched,
+    }
+
+
+def generate(count: int, seed: int = 0, shape: str = "normal", **knobs) -> Iterator[dict]:
+    """Yield ``count`` records lazily; ``shape`` overrides the knobs it stresses."""
+    for index in range(count):
+        record_shape = shape
+        if shape == "mixed":
+            record_shape = random.Random(f"{seed}:{index}:shape").choice(list(SHAPES))
+        record = generate_pair(seed, index, **{**knobs, **SHAPES[record_shape]})
+        yield {"shape": record_shape, **record}
+
+
+def write_jsonl(records: Iterator[dict], out: TextIO) -> int:
+    written = 0
+    for record in records:
+        out.write(json.dumps(record) + "\n")
+        written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSONL file, or - for stdout")
+    parser.add_argument("--format", dest="fmt", choices=["plain", "latex", "mixed"], default="mixed")
+    parser.add_argument("--shape", choices=[*SHAPES, "mixed"], default="normal")
+    parser.add_argument("--roles", type=int, default=4)
+    parser.add_argument("--bullets", type=int, default=5, help="bullets per role")
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--skills", type=int, default=25, help="skills listed on the resume")
+    parser.add_argument("--requirements", type=int, default=15, help="skills the JD asks for")
+    parser.add_argument("--overlap", type=float, default=0.6, help="share of JD skills the resume lists, 0-1")
+    parser.add_argument("--depth", type=int, default=0, help="brace nesting of the first bullet of each role")
+    args = parser.parse_args()
+
+    knobs = {
+        "fmt": args.fmt, "roles": args.roles, "bullets": args.bullets, "projects": args.projects,
+        "skills": args.skills, "requirements": args.requirements,
+        "overlap": min(1.0, max(0.0, args.overlap)), "depth": args.depth,
+    }
+    records = generate(args.count, args.seed, args.shape, **knobs)
+    if args.output == "-":
+        written = write_jsonl(records, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            written = write_jsonl(records, out)
+    print(f"wrote {written} records", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Tail-latency simulation — run with: python scripts/llm_hedge_sim.py [--latency "median=1,tail_p=0.05,tail=20"]
+
+Sends the same workload through generate_text against the fake provider
+twice, without and with hedging, and prints latency percentiles together
+with the hedge rate and how often the hedge won.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.config import get_settings
+from app.services import llm_client
+from app.services.llm_client import LLMCallStats, generate_text, set_llm_provider
+from app.services.llm_fake import FakeLLMProvider, LatencyDistribution
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(requests: int, concurrency: int, latency: LatencyDistribution, hedge: bool, seed: int) -> None:
+    settings = get_settings()
+    settings.llm_hedge_enabled = hedge
+    settings.llm_deadline_seconds = 60.0
+    settings.llm_max_retries = 0
+    llm_client.llm_call_stats = LLMCallStats()
+    set_llm_provider(FakeLLMProvider(latency=latency, seed=seed))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await generate_text(f"prompt {i}")
+            durations.append(time.perf_counter() - started)
+
+    await asyncio.gather(*[one(i) for i in range(requests)])
+
+    stats = llm_client.llm_call_stats
+    label = "hedged" if hedge else "plain"
+    print(
+        f"[{label:6}] p50 {percentile(durations, 0.5):6.2f}s  "
+        f"p95 {percentile(durations, 0.95):6.2f}s  p99 {percentile(durations, 0.99):6.2f}s  "
+        f"hedges {stats.hedges} ({stats.as_dict()['hedge_rate']:.1%})  hedge wins {stats.hedge_wins}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", default="median=1.0,sigma=0.25,tail_p=0.05,tail=20")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    latency = LatencyDistribution.parse(args.latency)
+    for hedge in (False, True):
+        asyncio.run(run(args.requests, args.concurrency, latency, hedge, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""LLM concurrency check — run with: python scripts/llm_load_test.py [--requests 20] [--latency 2.0]
+
+Fires concurrent analyze_with_llm calls against a fake provider with a fixed
+latency while a probe coroutine (standing in for /health) ticks every 10 ms.
+With non-blocking calls the wall time stays close to one LLM round-trip and
+the probe's worst stall stays in the millisecond range; the --blocking run
+reproduces the old synchronous generate_content behaviour for comparison.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.services.llm_client import set_llm_provider
+from app.services.llm_analyzer import analyze_with_llm
+
+FAKE_RESPONSE = '{"qualitative_fit": "good_match", "fit_explanation": "fake", "interview_readiness": 6}'
+
+
+class SleepProvider:
+    model_name = "fake-sleep"
+
+    def __init__(self, latency: float, blocking: bool):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def generate(self, prompt: str, timeout: float | None = None) -> str:
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return FAKE_RESPONSE
+
+
+async def probe(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(requests: int, latency: float, blocking: bool) -> None:
+    set_llm_provider(SleepProvider(latency, blocking))
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        analyze_with_llm(
+            resume_text=f"resume {i}",
+            jd_text="job description",
+            keyword_score=50,
+            semantic_score=50,
+            structure_score=50,
+        )
+        for i in range(requests)
+    ])
+    wall = time.perf_counter() - started
+
+    stop.set()
+    worst_stall = await probe_task
+    mode = "blocking" if blocking else "async"
+    ok = sum(1 for r in results if r is not None)
+    print(f"[{mode}] {ok}/{requests} calls, latency {latency:.2f}s each")
+    print(f"  wall time:        {wall:.2f}s (serial would be {requests * latency:.2f}s)")
+    print(f"  worst loop stall: {worst_stall * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=2.0)
+    parser.add_argument("--blocking", action="store_true", help="simulate the old synchronous call")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.latency, args.blocking))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Shared JD prefix simulation — run with: python scripts/llm_prefix_cache_sim.py [--resumes 100] [--ttl 2]
+
+Scores many resumes against one job description through analyze_with_llm
+with the fake provider, first with the context cache disabled and then
+enabled. Half-way through the cached run the script waits past the TTL so
+expiry and re-registration show up in the stats. Prints the characters sent
+to the provider and the prefix cache counters for each run.
+"""
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from app.config import get_settings
+from app.services import llm_gateway, llm_prefix_cache
+from app.services.llm_client import get_llm_cache, set_llm_provider
+from app.services.llm_analyzer import analyze_with_llm
+from app.services.llm_fake import FakeLLMProvider, LatencyDistribution
+
+JD = "Backend Engineer\n\nRequired Skills\n" + "\n".join(
+    f"- {skill} in production systems" for skill in (
+        "Python", "FastAPI", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "Terraform",
+    )
+) + "\n\nResponsibilities\n" + "\n".join(
+    f"- Own service area {i}: design, build, operate and improve reliability and latency" for i in range(40)
+)
+
+RESPONSE = '{"qualitative_fit": "good_match", "fit_explanation": "fake", "interview_readiness": 6}'
+
+
+async def run(resumes: int, ttl: float, enabled: bool) -> None:
+    settings = get_settings()
+    settings.llm_prefix_cache_enabled = enabled
+    settings.llm_prefix_cache_ttl_seconds = ttl
+    llm_prefix_cache._registry = None
+    llm_gateway._gateway = None  # its semaphore is bound to the previous event loop
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.clear()
+
+    provider = FakeLLMProvider(responder=lambda prompt: RESPONSE, latency=LatencyDistribution(median=0.05))
+    set_llm_provider(provider)
+
+    async def batch(start: int, count: int) -> None:
+        await asyncio.gather(*[
+            analyze_with_llm(
+                resume_text=f"Candidate {i}\n\nEXPERIENCE\n- Built service {i} with Python and Redis",
+                jd_text=JD,
+                keyword_score=50,
+                semantic_score=50,
+                structure_score=50,
+            )
+            for i in range(start, start + count)
+        ])
+
+    half = resumes // 2
+    await batch(0, half)
+    if enabled:
+        await asyncio.sleep(ttl)
+    await batch(half, resumes - half)
+
+    registry = llm_prefix_cache.get_prefix_registry()
+    label = "cached" if enabled else "plain"
+    print(f"[{label:6}] calls {provider.calls}  prompt chars sent {provider.prompt_chars_sent:,}")
+    if registry is not None:
+        print(f"         {registry.stats.as_dict()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--ttl", type=float, default=6.0)
+    args = parser.parse_args()
+
+    for enabled in (False, True):
+        asyncio.run(run(args.resumes, args.ttl, enabled))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""End-to-end load test — run with: python scripts/pipeline_load_test.py [--endpoint optimize] [--requests 200] [--concurrency 20]
+
+Drives /api/v1/analyze or /api/v1/optimize in-process (through httpx's ASGI
+transport) with the stand-in LLM provider, so the whole pipeline including
+the LLM path runs offline and deterministically. Prints throughput, latency
+percentiles and status codes, followed by the server's own LLM stats.
+
+Set LLM_RECORDINGS_PATH to replay responses recorded from Gemini; prompts
+that weren't recorded get synthesized responses. Needs httpx.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, ".")
+os.environ["LLM_PROVIDER"] = "standin"
+
+import httpx
+
+from app.config import get_settings
+
+RESUME = """Jane Smith
+jane@example.com | 555-987-6543 | https://github.com/janesmith
+
+SUMMARY
+Backend engineer with 5 years of Python, FastAPI and AWS experience.
+
+SKILLS
+Python, FastAPI, Django, PostgreSQL, Redis, Docker, Kubernetes, AWS, Git
+
+EXPERIENCE
+Software Engineer at DataCo
+Mar 2020 - Present
+- Designed REST APIs in FastAPI serving 10M requests per day
+- Migrated batch jobs to Airflow on Kubernetes, cutting failures by 70%
+- Tuned PostgreSQL queries, lowering report latency by 45%
+
+EDUCATION
+BS Computer Science, State University, 2019
+
+PROJECTS
+Task queue
+- Redis-backed task queue in Python with retries and rate limiting
+"""
+
+JD = """Senior Backend Engineer
+
+Required Skills:
+- Python, FastAPI or Django
+- PostgreSQL, Redis
+- Docker, Kubernetes, AWS
+
+Responsibilities:
+- Design and build scalable backend services
+- Own the reliability of our public APIs
+
+Preferred:
+- Terraform
+- GraphQL
+"""
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(args) -> None:
+    from app.main import app
+
+    resume_text = Path(args.resume).read_text(encoding="utf-8") if args.resume else RESUME
+    jd_text = Path(args.jd).read_text(encoding="utf-8") if args.jd else JD
+    url = f"/api/v1/{args.endpoint}"
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    durations: list[float] = []
+    statuses: Counter = Counter()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=120) as client:
+        async def one(i: int) -> None:
+            data = {
+                # Vary the resume so plain-text requests don't collapse into LLM cache hits;
+                # LaTeX prompts only carry the edited blocks and may still coalesce
+                "resume_text": resume_text + f"\nCandidate reference {i}\n",
+                "jd_text": jd_text,
+                "bypass_llm_cache": str(args.bypass_cache).lower(),
+            }
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(url, data=data)
+                durations.append(time.perf_counter() - started)
+                statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(args.requests)])
+        wall = time.perf_counter() - started
+        stats = (await client.get("/api/v1/stats")).json()
+
+    print(f"{args.requests} x POST {url}, concurrency {args.concurrency}, LLM latency {args.latency}")
+    print(f"  throughput: {args.requests / wall:.1f} req/s over {wall:.2f}s")
+    print(
+        f"  latency:    p50 {percentile(durations, 0.5):.3f}s  p95 {percentile(durations, 0.95):.3f}s"
+        f"  p99 {percentile(durations, 0.99):.3f}s  max {max(durations):.3f}s"
+    )
+    print(f"  statuses:   {dict(statuses)}")
+    for name in ("llm_calls", "llm_gateway", "llm_cache"):
+        print(f"  {name}: {stats.get(name)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoint", choices=["analyze", "optimize"], default="analyze")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", default="median=1.5,sigma=0.3", help="stand-in LLM latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--bypass-cache", action="store_true", help="skip LLM response cache lookups")
+    parser.add_argument("--resume", help="resume fixture file (plain text or .tex)")
+    parser.add_argument("--jd", help="job description fixture file")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    settings.llm_standin_latency = args.latency
+    settings.llm_standin_error_rate = args.error_rate
+    settings.llm_standin_seed = args.seed
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
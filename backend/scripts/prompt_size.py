@@ -0,0 +1,155 @@
+"""Prompt size check — run with: python scripts/prompt_size.py
+
+Builds the analysis and plain-text optimization prompts for a few fixture
+resume/JD pairs twice: once with the old fixed character slices and once with
+the token-budgeted prompt builder, and prints the estimated input tokens of
+each so changes to the budgets or section priorities can be compared.
+"""
+import sys
+
+sys.path.insert(0, ".")
+
+from app.services.resume_parser import parse_resume
+from app.services.jd_parser import parse_jd
+from app.services.keyword_matcher import compute_keyword_score
+from app.services.llm_analyzer import ANALYSIS_PROMPT
+from app.services.resume_optimizer import OPTIMIZE_PROMPT_PLAIN
+from app.services.prompt_builder import compact_jd, compact_resume, estimate_tokens
+
+BULLETS = [
+    "Built a real-time analytics dashboard with React, TypeScript and WebSocket streaming",
+    "Designed REST and GraphQL APIs in FastAPI serving 10M requests per day at p99 under 80 ms",
+    "Migrated batch ETL jobs from cron to Airflow on Kubernetes, cutting failed runs by 70%",
+    "Introduced CI/CD with GitHub Actions and Docker, reducing release time from days to hours",
+    "Mentored four engineers and ran weekly design reviews across two product teams",
+    "Tuned PostgreSQL indexes and query plans, lowering median report latency by 45%",
+]
+
+RESUME_SHORT = """Jane Smith
+jane@example.com | 555-987-6543
+
+SUMMARY
+Backend engineer with 4 years of Python and AWS experience.
+
+SKILLS
+Python, FastAPI, PostgreSQL, Docker, AWS, Redis
+
+EXPERIENCE
+Software Engineer at DataCo
+Mar 2021 - Present
+- """ + "\n- ".join(BULLETS[:4]) + """
+
+EDUCATION
+BS Computer Science, State University, 2020
+"""
+
+
+def _long_resume(roles: int) -> str:
+    experience = "\n\n".join(
+        f"Senior Engineer at Company {i}\nJan {2010 + i} - Dec {2011 + i}\n- " + "\n- ".join(BULLETS)
+        for i in range(roles)
+    )
+    return f"""Alex Johnson
+alex@example.com | 555-123-4567 | https://github.com/alexj
+
+SUMMARY
+Staff engineer with a decade of experience building data platforms and web products.
+
+SKILLS
+Python, FastAPI, Django, React, TypeScript, GraphQL, PostgreSQL, Redis, Kafka, Airflow, Docker, Kubernetes, AWS, Terraform
+
+EXPERIENCE
+{experience}
+
+PROJECTS
+Open-source task queue
+- Wrote a Redis-backed task queue in Python with retries and rate limiting
+- Reached 2k GitHub stars and 40 contributors
+
+EDUCATION
+MS Computer Science, Tech University, 2010
+
+CERTIFICATIONS
+AWS Certified Solutions Architect
+Certified Kubernetes Administrator
+
+VOLUNTEER
+Coding instructor at a local nonprofit, teaching Python to high-school students every weekend
+
+INTERESTS
+Climbing, chess, film photography, long-distance cycling
+"""
+
+
+JD_BOILERPLATE = """Senior Backend Engineer
+
+About the role
+We are a fast-growing fintech company on a mission to make payments simple for everyone.
+Our team of 300 people spans four continents and we ship to millions of customers every day.
+You will join the platform group that owns the core ledger and the public APIs.
+
+Responsibilities
+- Design and build scalable backend services in Python
+- Own the reliability of our REST and GraphQL APIs
+- Improve CI/CD pipelines and developer tooling
+
+Required Skills
+- 5+ years of Python, FastAPI or Django
+- PostgreSQL, Redis, Kafka
+- Docker, Kubernetes, AWS
+
+Preferred Qualifications
+- Experience with Terraform
+- Familiarity with React
+
+Benefits
+- Competitive salary and equity
+- Unlimited PTO, 16 weeks parental leave
+- Health, dental and vision insurance for you and your family
+- Home office stipend and annual learning budget
+We are an equal opportunity employer. All qualified applicants will receive consideration for
+employment without regard to race, color, religion, sex, sexual orientation, gender identity,
+national origin, disability or veteran status. We provide reasonable accommodations on request.
+"""
+
+FIXTURES = [
+    ("short resume", RESUME_SHORT, JD_BOILERPLATE),
+    ("3-role resume", _long_resume(3), JD_BOILERPLATE),
+    ("8-role resume", _long_resume(8), JD_BOILERPLATE),
+]
+
+
+def build_prompts(resume_text: str, jd_text: str, compacted: bool) -> tuple[str, str]:
+    if compacted:
+        parsed_resume = parse_resume(resume_text)
+        _, keyword_results = compute_keyword_score(parsed_resume, parse_jd(jd_text))
+        resume_part = compact_resume(resume_text, parsed_resume.sections, keyword_results)
+        jd_part = compact_jd(jd_text)
+    else:
+        resume_part, jd_part = resume_text[:4000], jd_text[:3000]
+
+    analysis = ANALYSIS_PROMPT.format(
+        resume_text=resume_part, jd_text=jd_part,
+        keyword_score=60, semantic_score=60, structure_score=60,
+    )
+    optimize = OPTIMIZE_PROMPT_PLAIN.format(
+        resume_text=resume_part, jd_text=jd_part,
+        missing_required="", missing_preferred="", weak_sections="",
+        current_score=60, existing_skills="",
+    )
+    return analysis, optimize
+
+
+def main():
+    print(f"{'fixture':<16}{'prompt':<10}{'sliced':>8}{'budgeted':>10}{'change':>9}")
+    for name, resume_text, jd_text in FIXTURES:
+        before = build_prompts(resume_text, jd_text, compacted=False)
+        after = build_prompts(resume_text, jd_text, compacted=True)
+        for label, old, new in zip(("analysis", "optimize"), before, after):
+            old_tokens, new_tokens = estimate_tokens(old), estimate_tokens(new)
+            change = (new_tokens - old_tokens) / old_tokens * 100
+            print(f"{name:<16}{label:<10}{old_tokens:>8}{new_tokens:>10}{change:>8.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Per-worker memory under gunicorn — run with: python scripts/worker_rss.py [--workers 4] [--requests 20]
+
+Starts gunicorn (gunicorn.conf.py) twice, once with the models preloaded in
+the master and once with GUNICORN_PRELOAD=false, sends a few /analyze
+requests to each so the workers touch the models, and prints RSS, PSS and
+private memory for every worker from /proc/<pid>/smaps_rollup. PSS splits
+shared pages between the processes sharing them, so its sum is what the box
+actually pays. Linux only; needs gunicorn and uvicorn installed.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, ".")
+
+RESUME = """Jane Smith
+jane@example.com | 555-987-6543
+
+SKILLS
+Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS
+
+EXPERIENCE
+Software Engineer at DataCo
+- Designed REST APIs in FastAPI serving 10M requests per day
+"""
+
+JD = """Backend Engineer
+
+Required Skills:
+- Python, FastAPI
+- PostgreSQL, Redis
+- Docker, Kubernetes
+"""
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid: int) -> list[int]:
+    result = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name is parenthesized and may contain spaces; the parent pid follows it
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            result.append(int(entry.name))
+    return sorted(result)
+
+
+def wait_ready(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/health", timeout=2)
+            return
+        except OSError:
+            time.sleep(1)
+    raise RuntimeError(f"gunicorn didn't become ready within {timeout}s")
+
+
+def measure(preload: bool, args) -> None:
+    env = {
+        **os.environ,
+        "GUNICORN_PRELOAD": str(preload).lower(),
+        "WEB_CONCURRENCY": str(args.workers),
+        "PORT": str(args.port),
+        "SCORING_WORKERS": "0",
+        "OPTIMIZE_JOB_WORKERS": "0",
+        "ANALYSIS_CACHE_ENABLED": "false",
+    }
+    master = subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(args.port, args.timeout)
+        # Without preload each worker loads its models before serving; give the slowest time to finish
+        time.sleep(args.settle)
+        body = urllib.parse.urlencode({
+            "resume_text": RESUME, "jd_text": JD, "include_llm_analysis": "false",
+        }).encode()
+        for _ in range(args.requests):
+            urllib.request.urlopen(f"http://127.0.0.1:{args.port}/api/v1/analyze", data=body, timeout=60).read()
+
+        workers = children(master.pid)
+        label = "preloaded" if preload else "per-worker"
+        print(f"[{label}] master pid {master.pid}: {memory_kb(master.pid)}")
+        totals = {"rss": 0, "pss": 0, "private": 0}
+        for pid in workers:
+            usage = memory_kb(pid)
+            for key in totals:
+                totals[key] += usage[key]
+            print(f"  worker {pid}: rss {usage['rss'] // 1024} MB  pss {usage['pss'] // 1024} MB"
+                  f"  private {usage['private'] // 1024} MB")
+        print(f"  total over {len(workers)} workers: rss {totals['rss'] // 1024} MB"
+              f"  pss {totals['pss'] // 1024} MB  private {totals['private'] // 1024} MB")
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20, help="/analyze requests before measuring")
+    parser.add_argument("--port", type=int, default=7861)
+    parser.add_argument("--timeout", type=float, default=180.0, help="seconds to wait for the server")
+    parser.add_argument("--settle", type=float, default=20.0, help="seconds to wait after the first worker is ready")
+    args = parser.parse_args()
+
+    for preload in (True, False):
+        measure(preload, args)
+
+
+if __name__ == "__main__":
+    main()
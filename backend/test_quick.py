@@ -7,6 +7,7 @@ from app.services.jd_parser import parse_jd
 from app.services.keyword_matcher import compute_keyword_score
 from app.services.structure_scorer import compute_structure_score
 from app.services.score_aggregator import compute_overall_score, get_recruiter_status, get_rank_estimate
+from app.services.latex_parser import validate_latex_syntax
 
 RESUME = """John Doe
 john@example.com | 555-123-4567
@@ -112,4 +113,26 @@ rank = get_rank_estimate(overall)
 print(f"  Overall Score: {overall}")
 print(f"  Recruiter Status: {status}")
 print(f"  Rank Estimate: {rank}")
+
+# Jake's template defines list macros that each hold half of an environment
+LATEX = r"""\documentclass[letterpaper,11pt]{article}
+\newcommand{\resumeItem}[1]{\item\small{{#1 \vspace{-2pt}}}}
+\newcommand{\resumeItemListStart}{\begin{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}}
+\begin{document}
+\section{Experience}
+  \resumeItemListStart
+    \resumeItem{Built a real-time dashboard using \textbf{React}, 50\% faster}
+  \resumeItemListEnd
+\end{document}
+"""
+
+print("\n=== LaTeX Validation ===")
+latex_check = validate_latex_syntax(LATEX)
+print(f"  Template preamble valid: {latex_check['valid']} {latex_check['errors']}")
+assert latex_check["valid"], latex_check["errors"]
+unclosed_check = validate_latex_syntax(LATEX.replace("  \\resumeItemListEnd\n", "  \\begin{center}\n"))
+print(f"  Unclosed environment caught: {not unclosed_check['valid']} {unclosed_check['errors']}")
+assert not unclosed_check["valid"]
+
 print("\n=== ALL TESTS PASSED ===")
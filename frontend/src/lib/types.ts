@@ -199,6 +199,8 @@ export interface OptimizeResponse {
   latex_validation: {
     valid: boolean;
     errors: string[];
+    line: number | null;
+    column: number | null;
   } | null;
   fabricated_skills_removed: string[];
   keywords_added: string[];